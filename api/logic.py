@@ -1,6 +1,6 @@
-from typing import List, Tuple, Dict, Optional, Any
-from dataclasses import dataclass
-import random
+from typing import List, Tuple, Dict, Optional, Any, Union
+from dataclasses import dataclass, field
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,14 +15,51 @@ class Config:
     MIN_DELIVERY_DAYS = 1
     MAX_DELIVERY_DAYS = 365
     # 영어 전략명으로 변경 (main.py와 일치)
-    ALLOWED_STRATEGIES = ["aggressive", "conservative", "balanced"]
-    PAYMENT_METHODS = ["현금", "30일 후불", "60일 후불", "90일 후불", "분할결제"]
-    QUALITY_GRADES = ["A급", "B급", "C급", "표준"]
-    MARKET_POSITIONS = ["strong", "weak", "neutral"]
-    URGENCY_LEVELS = ["high", "medium", "low"]
+    # *_LIST는 순서가 필요한 곳(오류 메시지 등)용, 나머지는 멤버십 검사용 frozenset
+    ALLOWED_STRATEGIES_LIST = ["aggressive", "conservative", "balanced"]
+    PAYMENT_METHODS_LIST = ["현금", "30일 후불", "60일 후불", "90일 후불", "분할결제"]
+    QUALITY_GRADES_LIST = ["A급", "B급", "C급", "표준"]
+    MARKET_POSITIONS_LIST = ["strong", "weak", "neutral"]
+    URGENCY_LEVELS_LIST = ["high", "medium", "low"]
+    ALLOWED_STRATEGIES = frozenset(ALLOWED_STRATEGIES_LIST)
+    PAYMENT_METHODS = frozenset(PAYMENT_METHODS_LIST)
+    QUALITY_GRADES = frozenset(QUALITY_GRADES_LIST)
+    MARKET_POSITIONS = frozenset(MARKET_POSITIONS_LIST)
+    URGENCY_LEVELS = frozenset(URGENCY_LEVELS_LIST)
+
+# 실효 가격 계산용 배수 (호출마다 dict를 새로 만들지 않도록 모듈 수준에 둠)
+_PAYMENT_MULT = {
+    "현금": 0.95,
+    "30일 후불": 1.0,
+    "60일 후불": 1.02,
+    "90일 후불": 1.05,
+    "분할결제": 1.03
+}
+_QUALITY_MULT = {
+    "A급": 1.15,
+    "B급": 1.08,
+    "C급": 0.95,
+    "표준": 1.0
+}
+# 품질 등급별 리스크 점수 (성과 지표 계산용)
+_QUALITY_RISK = {"A급": 5, "B급": 15, "C급": 30, "표준": 20}
+# 전략별 라운드당 가격 조정률 (판매자는 인하, 구매자는 인상)
+_SELLER_ADJ_RATE = {"aggressive": -0.02, "conservative": -0.005, "balanced": -0.01}
+_BUYER_ADJ_RATE = {"aggressive": 0.03, "conservative": 0.01, "balanced": 0.02}
+# 판매자 시장 위치 / 구매자 긴급도에 따른 가격 조정 배수
+_MARKET_POSITION_MULT = {"strong": 1.02, "weak": 0.98, "neutral": 1.0}
+_URGENCY_MULT = {"high": 1.05, "medium": 1.0, "low": 0.98}
+# 라운드 로그 템플릿 (verbose=False일 때는 인자만 튜플로 기록해두고 format_log에서 포맷)
+_LOG_TEMPLATES = {
+    "round": "--- 라운드 {} ---",
+    "seller_offer": "판매자 오퍼: 가격={:.2f}, 수량={}, 납기={}",
+    "buyer_offer": "구매자 오퍼: 가격={:.2f}, 수량={}, 납기={}",
+}
+# 로그 항목: 포맷된 문자열 또는 (템플릿 키, 인자...) 튜플
+LogEntry = Union[str, Tuple[Any, ...]]
 
 # --- Offer 클래스 ---
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Offer:
     price: float
     qty: int
@@ -32,58 +69,58 @@ class Offer:
     warranty_months: int = 12
     penalty_rate: float = 0.0
     discount_rate: float = 0.0
+    # 생성 시 한 번만 계산되는 유효성 플래그
+    is_valid: bool = field(init=False, repr=False, compare=False)
+    # 처음 계산한 실효 가격 (응답/결과 변환에서 같은 오퍼에 대해 재사용)
+    _cached_eff: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "is_valid", self.validate())
 
     def validate(self) -> bool:
         """오퍼 유효성 검증"""
+        # 실패 가능성이 높은 조건을 앞에 둠: 가격/수량/납기는 전략에 따라 범위를 벗어날 수 있고,
+        # 결제조건과 품질등급은 에이전트가 항상 유효한 상수로 채우므로 마지막에 확인
         try:
             return (
                 Config.MIN_PRICE <= self.price <= Config.MAX_PRICE and
                 Config.MIN_QUANTITY <= self.qty <= Config.MAX_QUANTITY and
                 Config.MIN_DELIVERY_DAYS <= self.delivery <= Config.MAX_DELIVERY_DAYS and
-                self.payment_method in Config.PAYMENT_METHODS and
-                self.quality_grade in Config.QUALITY_GRADES and
-                0 <= self.warranty_months <= 60 and
                 0 <= self.penalty_rate <= 10 and
-                0 <= self.discount_rate <= 20
+                0 <= self.discount_rate <= 20 and
+                0 <= self.warranty_months <= 60 and
+                self.quality_grade in Config.QUALITY_GRADES and
+                self.payment_method in Config.PAYMENT_METHODS
             )
         except (TypeError, ValueError):
             return False
 
     def calculate_effective_price(self) -> float:
-        """실효 가격 계산"""
-        payment_multiplier = {
-            "현금": 0.95,
-            "30일 후불": 1.0,
-            "60일 후불": 1.02,
-            "90일 후불": 1.05,
-            "분할결제": 1.03
-        }
-        quality_multiplier = {
-            "A급": 1.15,
-            "B급": 1.08,
-            "C급": 0.95,
-            "표준": 1.0
-        }
+        """실효 가격 계산 (오퍼는 불변이므로 첫 계산 결과를 보관)"""
+        if self._cached_eff is not None:
+            return self._cached_eff
         
         warranty_multiplier = 1 + (self.warranty_months - 12) * 0.015
         volume_discount = 1 - (self.discount_rate / 100)
         
         effective_price = (
             self.price * 
-            payment_multiplier.get(self.payment_method, 1.0) * 
-            quality_multiplier.get(self.quality_grade, 1.0) * 
+            _PAYMENT_MULT.get(self.payment_method, 1.0) * 
+            _QUALITY_MULT.get(self.quality_grade, 1.0) * 
             warranty_multiplier * 
             volume_discount
         )
         
-        return max(0, effective_price)
+        effective_price = max(0, effective_price)
+        object.__setattr__(self, "_cached_eff", effective_price)
+        return effective_price
 
     def calculate_total_value(self) -> float:
         """총 가치 계산"""
         return self.calculate_effective_price() * self.qty
 
 # --- 협상 성과 지표 ---
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NegotiationMetrics:
     total_value: float = 0.0
     seller_satisfaction: float = 0.0
@@ -99,18 +136,35 @@ class NegotiationMetrics:
 class InputValidator:
     @staticmethod
     def validate_numeric_input(value: Any, min_val: float, max_val: float, name: str) -> float:
-        try:
+        # 대부분의 호출(FastAPI 경유)은 이미 숫자이므로 예외 처리 없이 바로 변환
+        if isinstance(value, (int, float)):
             num_value = float(value)
-            if not (min_val <= num_value <= max_val):
-                raise ValueError(f"{name}은(는) {min_val}~{max_val} 범위여야 합니다.")
-            return num_value
-        except (TypeError, ValueError) as e:
+        else:
+            try:
+                num_value = float(value)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"{name} 값이 올바르지 않습니다: {str(e)}")
+        try:
+            in_range = min_val <= num_value <= max_val
+        except TypeError as e:
+            # min_val/max_val이 호출자의 원본 입력(예: 문자열 원가)일 때
             raise ValueError(f"{name} 값이 올바르지 않습니다: {str(e)}")
+        if not in_range:
+            raise ValueError(f"{name} 값이 올바르지 않습니다: {name}은(는) {min_val}~{max_val} 범위여야 합니다.")
+        return num_value
+
+    @staticmethod
+    def is_allowed(value: Any, allowed: frozenset) -> bool:
+        # frozenset 조회는 해시 불가능한 값(리스트 등)에 TypeError를 내므로 허용되지 않은 값으로 처리
+        try:
+            return value in allowed
+        except TypeError:
+            return False
 
     @staticmethod
     def validate_strategy(strategy: str) -> str:
-        if strategy not in Config.ALLOWED_STRATEGIES:
-            raise ValueError(f"허용되지 않는 전략입니다: {strategy}. 허용된 전략: {Config.ALLOWED_STRATEGIES}")
+        if not InputValidator.is_allowed(strategy, Config.ALLOWED_STRATEGIES):
+            raise ValueError(f"허용되지 않는 전략입니다: {strategy}. 허용된 전략: {Config.ALLOWED_STRATEGIES_LIST}")
         return strategy
 
     @staticmethod
@@ -121,20 +175,64 @@ class InputValidator:
             raise ValueError(f"납기는 {Config.MIN_DELIVERY_DAYS}~{Config.MAX_DELIVERY_DAYS}일 범위여야 합니다.")
         return (start, end)
 
+# --- 에이전트 파라미터 검증 (같은 조합은 한 번만 검증) ---
+# typed=True: 800과 800.0처럼 값은 같아도 타입이 다른 입력은 따로 검증/보관
+@lru_cache(maxsize=256, typed=True)
+def _validated_seller_params(cost, target_price, min_qty, delivery_range, strategy, profit_margin, market_position) -> Tuple:
+    """판매자 입력값 검증 (검증된 값 튜플 반환, 잘못된 입력은 ValueError이며 캐시되지 않음)"""
+    validated = (
+        InputValidator.validate_numeric_input(cost, Config.MIN_PRICE, Config.MAX_PRICE, "원가"),
+        InputValidator.validate_numeric_input(target_price, cost, Config.MAX_PRICE, "목표가격"),
+        int(InputValidator.validate_numeric_input(min_qty, Config.MIN_QUANTITY, Config.MAX_QUANTITY, "최소수량")),
+        InputValidator.validate_delivery_range(delivery_range[0], delivery_range[1]),
+        InputValidator.validate_strategy(strategy),
+        InputValidator.validate_numeric_input(profit_margin, 0, 100, "이익률"),
+    )
+    if not InputValidator.is_allowed(market_position, Config.MARKET_POSITIONS):
+        raise ValueError(f"시장위치는 {Config.MARKET_POSITIONS_LIST} 중 하나여야 합니다.")
+    return validated
+
+@lru_cache(maxsize=256, typed=True)
+def _validated_buyer_params(target_price, target_qty, desired_delivery, strategy, budget_limit, urgency) -> Tuple:
+    """구매자 입력값 검증 (검증된 값 튜플 반환, 잘못된 입력은 ValueError이며 캐시되지 않음)"""
+    validated = (
+        InputValidator.validate_numeric_input(target_price, Config.MIN_PRICE, Config.MAX_PRICE, "목표가격"),
+        int(InputValidator.validate_numeric_input(target_qty, Config.MIN_QUANTITY, Config.MAX_QUANTITY, "목표수량")),
+        int(InputValidator.validate_numeric_input(desired_delivery, Config.MIN_DELIVERY_DAYS, Config.MAX_DELIVERY_DAYS, "희망납기")),
+        InputValidator.validate_strategy(strategy),
+        InputValidator.validate_numeric_input(budget_limit, target_price, Config.MAX_PRICE, "예산한도"),
+    )
+    if not InputValidator.is_allowed(urgency, Config.URGENCY_LEVELS):
+        raise ValueError(f"긴급도는 {Config.URGENCY_LEVELS_LIST} 중 하나여야 합니다.")
+    return validated
+
+def _validate_params(cached_validator, *args) -> Tuple:
+    """캐시된 검증 함수 호출 (리스트 등 해시 불가능한 입력은 캐시를 거치지 않고 바로 검증)"""
+    try:
+        return cached_validator(*args)
+    except TypeError:
+        # lru_cache 키 생성 실패 시에도 원래의 검증 오류 메시지가 나가도록 원본 함수로 재검증
+        return cached_validator.__wrapped__(*args)
+
 # --- Seller 에이전트 ---
 class SecureSellerAgent:
+    __slots__ = (
+        "cost", "target_price", "min_qty", "delivery_range", "strategy", "profit_margin",
+        "market_position", "_adj_rate", "_pos_mult", "_price_floor",
+        "offer_price", "offer_qty", "offer_delivery", "preferred_payment", "min_quality",
+        "max_warranty", "rounds_participated", "concession_history",
+    )
+
     def __init__(self, cost, target_price, min_qty, delivery_range, strategy, profit_margin, market_position):
-        # 입력값 검증
-        self.cost = InputValidator.validate_numeric_input(cost, Config.MIN_PRICE, Config.MAX_PRICE, "원가")
-        self.target_price = InputValidator.validate_numeric_input(target_price, cost, Config.MAX_PRICE, "목표가격")
-        self.min_qty = int(InputValidator.validate_numeric_input(min_qty, Config.MIN_QUANTITY, Config.MAX_QUANTITY, "최소수량"))
-        self.delivery_range = InputValidator.validate_delivery_range(delivery_range[0], delivery_range[1])
-        self.strategy = InputValidator.validate_strategy(strategy)
-        self.profit_margin = InputValidator.validate_numeric_input(profit_margin, 0, 100, "이익률")
-        
-        if market_position not in Config.MARKET_POSITIONS:
-            raise ValueError(f"시장위치는 {Config.MARKET_POSITIONS} 중 하나여야 합니다.")
+        # 입력값 검증 (반복 시뮬레이션에서는 캐시된 검증 결과 재사용)
+        (self.cost, self.target_price, self.min_qty, self.delivery_range,
+         self.strategy, self.profit_margin) = _validate_params(
+            _validated_seller_params, cost, target_price, min_qty, tuple(delivery_range), strategy, profit_margin, market_position
+        )
         self.market_position = market_position
+        self._adj_rate = _SELLER_ADJ_RATE[self.strategy]
+        self._pos_mult = _MARKET_POSITION_MULT[market_position]
+        self._price_floor = self.cost * 1.05  # 제안가 하한 (원가 + 최소 5%)
         
         # 초기 오퍼 설정
         self.offer_price = target_price
@@ -150,7 +248,9 @@ class SecureSellerAgent:
         """현재 조건으로 오퍼 생성"""
         # 전략에 따른 조정
         price_adjustment = self._get_price_adjustment()
-        adjusted_price = max(self.cost * 1.05, self.offer_price * price_adjustment)
+        adjusted_price = self.offer_price * price_adjustment
+        if not adjusted_price > self._price_floor:
+            adjusted_price = self._price_floor
         
         offer = Offer(
             price=adjusted_price,
@@ -164,7 +264,7 @@ class SecureSellerAgent:
         )
         
         # 유효성 검증
-        if not offer.validate():
+        if not offer.is_valid:
             logger.warning("판매자 오퍼 유효성 검증 실패, 기본값으로 조정")
             offer = self._create_safe_offer()
         
@@ -172,22 +272,9 @@ class SecureSellerAgent:
 
     def _get_price_adjustment(self) -> float:
         """전략에 따른 가격 조정 계수"""
-        base_adjustment = 1.0
-        
-        if self.strategy == "aggressive":
-            base_adjustment = 1.0 - (self.rounds_participated * 0.02)  # 라운드마다 2% 감소
-        elif self.strategy == "conservative":
-            base_adjustment = 1.0 - (self.rounds_participated * 0.005)  # 라운드마다 0.5% 감소
-        else:  # balanced
-            base_adjustment = 1.0 - (self.rounds_participated * 0.01)  # 라운드마다 1% 감소
-        
-        # 시장 위치에 따른 조정
-        if self.market_position == "strong":
-            base_adjustment *= 1.02
-        elif self.market_position == "weak":
-            base_adjustment *= 0.98
-        
-        return max(0.8, base_adjustment)  # 최소 20% 할인까지
+        # 전략별 라운드당 조정률과 시장 위치 배수는 생성 시 테이블에서 조회해 둠
+        base_adjustment = (1.0 + self.rounds_participated * self._adj_rate) * self._pos_mult
+        return base_adjustment if base_adjustment > 0.8 else 0.8  # 최소 20% 할인까지
 
     def _calculate_discount(self) -> float:
         """할인율 계산"""
@@ -208,42 +295,55 @@ class SecureSellerAgent:
             discount_rate=0.0
         )
 
-    def respond(self, buyer_offer: Offer) -> str:
-        """구매자 오퍼에 대한 응답"""
+    def respond(self, buyer_offer: Offer, effective_price: Optional[float] = None) -> str:
+        """구매자 오퍼에 대한 응답 (effective_price: 호출자가 이미 계산한 실효 가격)"""
         self.rounds_participated += 1
         
-        if not buyer_offer or not buyer_offer.validate():
+        if not buyer_offer or not buyer_offer.is_valid:
+            return "counter"
+        
+        # 값싼 수량/납기 조건을 먼저 확인
+        terms_ok = (buyer_offer.qty >= self.min_qty and
+                    self.delivery_range[0] <= buyer_offer.delivery <= self.delivery_range[1])
+        # 너무 많은 라운드가 진행되면 조건을 완화
+        relaxed = self.rounds_participated >= Config.MAX_ROUNDS - 2
+        
+        # 수량/납기가 맞지 않고 완화 단계도 아니면 실효 가격을 계산할 필요가 없음
+        if not terms_ok and not relaxed:
             return "counter"
         
-        effective_price = buyer_offer.calculate_effective_price()
+        if effective_price is None:
+            effective_price = buyer_offer.calculate_effective_price()
         min_acceptable = self.cost * (1 + self.profit_margin / 100)
         
         # 수락 조건 확인
-        if (effective_price >= min_acceptable and 
-            buyer_offer.qty >= self.min_qty and
-            self.delivery_range[0] <= buyer_offer.delivery <= self.delivery_range[1]):
+        if terms_ok and effective_price >= min_acceptable:
             return "accept"
         
-        # 너무 많은 라운드가 진행되면 조건을 완화
-        if self.rounds_participated >= Config.MAX_ROUNDS - 2:
-            if effective_price >= self.cost * 1.02:  # 최소 2% 마진
-                return "accept"
+        if relaxed and effective_price >= self.cost * 1.02:  # 최소 2% 마진
+            return "accept"
         
         return "counter"
 
 # --- Buyer 에이전트 ---
 class SecureBuyerAgent:
+    __slots__ = (
+        "target_price", "target_qty", "desired_delivery", "strategy", "budget_limit",
+        "urgency", "_is_urgent", "_adj_rate", "_urgency_mult",
+        "offer_price", "offer_qty", "offer_delivery", "preferred_payment", "min_quality",
+        "required_warranty", "rounds_participated", "concession_history",
+    )
+
     def __init__(self, target_price, target_qty, desired_delivery, strategy, budget_limit, urgency):
-        # 입력값 검증
-        self.target_price = InputValidator.validate_numeric_input(target_price, Config.MIN_PRICE, Config.MAX_PRICE, "목표가격")
-        self.target_qty = int(InputValidator.validate_numeric_input(target_qty, Config.MIN_QUANTITY, Config.MAX_QUANTITY, "목표수량"))
-        self.desired_delivery = int(InputValidator.validate_numeric_input(desired_delivery, Config.MIN_DELIVERY_DAYS, Config.MAX_DELIVERY_DAYS, "희망납기"))
-        self.strategy = InputValidator.validate_strategy(strategy)
-        self.budget_limit = InputValidator.validate_numeric_input(budget_limit, target_price, Config.MAX_PRICE, "예산한도")
-        
-        if urgency not in Config.URGENCY_LEVELS:
-            raise ValueError(f"긴급도는 {Config.URGENCY_LEVELS} 중 하나여야 합니다.")
+        # 입력값 검증 (반복 시뮬레이션에서는 캐시된 검증 결과 재사용)
+        (self.target_price, self.target_qty, self.desired_delivery,
+         self.strategy, self.budget_limit) = _validate_params(
+            _validated_buyer_params, target_price, target_qty, desired_delivery, strategy, budget_limit, urgency
+        )
         self.urgency = urgency
+        self._is_urgent = urgency == "high"  # respond()에서 매 라운드 문자열 비교하지 않도록
+        self._adj_rate = _BUYER_ADJ_RATE[self.strategy]
+        self._urgency_mult = _URGENCY_MULT[urgency]
         
         # 초기 오퍼 설정
         self.offer_price = target_price
@@ -259,7 +359,9 @@ class SecureBuyerAgent:
         """현재 조건으로 오퍼 생성"""
         # 전략에 따른 조정
         price_adjustment = self._get_price_adjustment()
-        adjusted_price = min(self.budget_limit, self.offer_price * price_adjustment)
+        adjusted_price = self.offer_price * price_adjustment
+        if not adjusted_price < self.budget_limit:
+            adjusted_price = self.budget_limit
         
         offer = Offer(
             price=adjusted_price,
@@ -273,7 +375,7 @@ class SecureBuyerAgent:
         )
         
         # 유효성 검증
-        if not offer.validate():
+        if not offer.is_valid:
             logger.warning("구매자 오퍼 유효성 검증 실패, 기본값으로 조정")
             offer = self._create_safe_offer()
         
@@ -281,22 +383,9 @@ class SecureBuyerAgent:
 
     def _get_price_adjustment(self) -> float:
         """전략에 따른 가격 조정 계수"""
-        base_adjustment = 1.0
-        
-        if self.strategy == "aggressive":
-            base_adjustment = 1.0 + (self.rounds_participated * 0.03)  # 라운드마다 3% 증가
-        elif self.strategy == "conservative":
-            base_adjustment = 1.0 + (self.rounds_participated * 0.01)  # 라운드마다 1% 증가
-        else:  # balanced
-            base_adjustment = 1.0 + (self.rounds_participated * 0.02)  # 라운드마다 2% 증가
-        
-        # 긴급도에 따른 조정
-        if self.urgency == "high":
-            base_adjustment *= 1.05
-        elif self.urgency == "low":
-            base_adjustment *= 0.98
-        
-        return min(1.5, base_adjustment)  # 최대 50% 증가까지
+        # 전략별 라운드당 조정률과 긴급도 배수는 생성 시 테이블에서 조회해 둠
+        base_adjustment = (1.0 + self.rounds_participated * self._adj_rate) * self._urgency_mult
+        return base_adjustment if base_adjustment < 1.5 else 1.5  # 최대 50% 증가까지
 
     def _create_safe_offer(self) -> Offer:
         """안전한 기본 오퍼 생성"""
@@ -311,30 +400,69 @@ class SecureBuyerAgent:
             discount_rate=0.0
         )
 
-    def respond(self, seller_offer: Offer) -> str:
-        """판매자 오퍼에 대한 응답"""
+    def respond(self, seller_offer: Offer, effective_price: Optional[float] = None) -> str:
+        """판매자 오퍼에 대한 응답 (effective_price: 호출자가 이미 계산한 실효 가격)"""
         self.rounds_participated += 1
         
-        if not seller_offer or not seller_offer.validate():
+        if not seller_offer or not seller_offer.is_valid:
             return "counter"
         
-        effective_price = seller_offer.calculate_effective_price()
+        # 값싼 수량/납기 조건을 먼저 확인
+        terms_ok = (seller_offer.qty >= self.target_qty * 0.8 and  # 목표 수량의 80% 이상
+                    seller_offer.delivery <= self.desired_delivery * 1.2)  # 희망 납기의 120% 이하
+        # 긴급하거나 너무 많은 라운드가 진행되면 조건을 완화
+        relaxed = ((self._is_urgent and self.rounds_participated >= 5) or
+                   self.rounds_participated >= Config.MAX_ROUNDS - 2)
+        
+        # 수량/납기가 맞지 않고 완화 단계도 아니면 실효 가격을 계산할 필요가 없음
+        if not terms_ok and not relaxed:
+            return "counter"
+        
+        if effective_price is None:
+            effective_price = seller_offer.calculate_effective_price()
         total_cost = effective_price * seller_offer.qty
         
         # 수락 조건 확인
-        if (total_cost <= self.budget_limit and 
-            seller_offer.qty >= self.target_qty * 0.8 and  # 목표 수량의 80% 이상
-            seller_offer.delivery <= self.desired_delivery * 1.2):  # 희망 납기의 120% 이하
+        if terms_ok and total_cost <= self.budget_limit:
             return "accept"
         
-        # 긴급하거나 너무 많은 라운드가 진행되면 조건을 완화
-        if (self.urgency == "high" and self.rounds_participated >= 5) or self.rounds_participated >= Config.MAX_ROUNDS - 2:
-            if total_cost <= self.budget_limit * 1.1:  # 예산의 110%까지 허용
-                return "accept"
+        if relaxed and total_cost <= self.budget_limit * 1.1:  # 예산의 110%까지 허용
+            return "accept"
         
         return "counter"
 
 # --- 협상 분석기 ---
+def _metrics_core(price: float, qty: int, delivery: int, quality_risk: float, penalty_rate: float,
+                  cost: float, target_price: float, budget_limit: float, rounds: int) -> Tuple:
+    """성과 지표 수치 계산 (NegotiationMetrics 필드 순서의 튜플 반환)"""
+    # 기본 지표 계산
+    total_value = price * qty
+    
+    # 만족도 계산
+    seller_satisfaction = min(100, max(0, (price / target_price) * 100))
+    buyer_satisfaction = min(100, max(0, ((budget_limit - price) / budget_limit) * 100))
+    
+    # Win-Win 점수 계산
+    if seller_satisfaction > 0 and buyer_satisfaction > 0:
+        win_win_score = 2 * (seller_satisfaction * buyer_satisfaction) / (seller_satisfaction + buyer_satisfaction)
+    else:
+        win_win_score = 0
+    
+    # 리스크 점수 계산
+    delivery_risk = max(0, (delivery - 3) * 10)
+    penalty_risk = penalty_rate * 10
+    risk_score = min(100, delivery_risk + quality_risk + penalty_risk)
+    
+    # 기타 지표
+    delivery_reliability = max(0, min(100, (21 - delivery) * 5))
+    price_competitiveness = min(100, max(0, ((cost * 2 - price) / cost) * 100))
+    
+    # 협상 효율성
+    negotiation_efficiency = max(0, min(100, (Config.MAX_ROUNDS - rounds) / Config.MAX_ROUNDS * 100))
+    
+    return (total_value, seller_satisfaction, buyer_satisfaction, risk_score, delivery_reliability,
+            price_competitiveness, win_win_score, rounds, negotiation_efficiency)
+
 class NegotiationAnalyzer:
     @staticmethod
     def calculate_metrics(seller_agent, buyer_agent, final_offer, rounds) -> NegotiationMetrics:
@@ -343,53 +471,41 @@ class NegotiationAnalyzer:
             return NegotiationMetrics(rounds_completed=rounds)
         
         try:
-            # 기본 지표 계산
-            total_value = final_offer["price"] * final_offer["qty"]
-            
-            # 만족도 계산
-            seller_satisfaction = min(100, max(0, 
-                (final_offer["price"] / seller_agent.target_price) * 100))
-            buyer_satisfaction = min(100, max(0, 
-                ((buyer_agent.budget_limit - final_offer["price"]) / buyer_agent.budget_limit) * 100))
-            
-            # Win-Win 점수 계산
-            if seller_satisfaction > 0 and buyer_satisfaction > 0:
-                win_win_score = 2 * (seller_satisfaction * buyer_satisfaction) / (seller_satisfaction + buyer_satisfaction)
-            else:
-                win_win_score = 0
-            
-            # 리스크 점수 계산
-            delivery_risk = max(0, (final_offer.get("delivery", 7) - 3) * 10)
-            quality_risk = {"A급": 5, "B급": 15, "C급": 30, "표준": 20}.get(
-                final_offer.get("quality_grade", "표준"), 20)
-            penalty_risk = final_offer.get("penalty_rate", 1) * 10
-            risk_score = min(100, delivery_risk + quality_risk + penalty_risk)
-            
-            # 기타 지표
-            delivery_reliability = max(0, min(100, (21 - final_offer.get("delivery", 7)) * 5))
-            price_competitiveness = min(100, max(0, 
-                ((seller_agent.cost * 2 - final_offer["price"]) / seller_agent.cost) * 100))
-            
-            # 협상 효율성
-            negotiation_efficiency = max(0, min(100, (Config.MAX_ROUNDS - rounds) / Config.MAX_ROUNDS * 100))
-            
-            return NegotiationMetrics(
-                total_value=total_value,
-                seller_satisfaction=seller_satisfaction,
-                buyer_satisfaction=buyer_satisfaction,
-                risk_score=risk_score,
-                delivery_reliability=delivery_reliability,
-                price_competitiveness=price_competitiveness,
-                win_win_score=win_win_score,
-                rounds_completed=rounds,
-                negotiation_efficiency=negotiation_efficiency
-            )
+            quality_risk = _QUALITY_RISK.get(final_offer.get("quality_grade", "표준"), 20)
+            return NegotiationMetrics(*_metrics_core(
+                final_offer["price"],
+                final_offer["qty"],
+                final_offer.get("delivery", 7),
+                quality_risk,
+                final_offer.get("penalty_rate", 1),
+                seller_agent.cost,
+                seller_agent.target_price,
+                buyer_agent.budget_limit,
+                rounds
+            ))
         
         except Exception as e:
-            logger.error(f"지표 계산 중 오류: {str(e)}")
+            logger.error("지표 계산 중 오류: %s", e)
             return NegotiationMetrics(rounds_completed=rounds)
 
 # --- 시뮬레이터 ---
+def _offer_to_result(offer: Offer, effective_price: Optional[float] = None) -> Dict:
+    """수락된 오퍼를 API 응답용 dict로 변환 (실효 가격은 한 번만 계산)"""
+    if effective_price is None:
+        effective_price = offer.calculate_effective_price()
+    return {
+        "price": offer.price,
+        "qty": offer.qty,
+        "delivery": offer.delivery,
+        "payment_method": offer.payment_method,
+        "quality_grade": offer.quality_grade,
+        "warranty_months": offer.warranty_months,
+        "penalty_rate": offer.penalty_rate,
+        "discount_rate": offer.discount_rate,
+        "effective_price": effective_price,
+        "total_value": effective_price * offer.qty
+    }
+
 class NegotiationSimulator:
     @staticmethod
     def simulate_negotiation(
@@ -405,13 +521,21 @@ class NegotiationSimulator:
         profit_margin: float,
         budget_limit: float,
         market_position: str,
-        urgency: str
-    ) -> Tuple[List[str], Optional[Dict], List[int], List[Tuple[float, float]], List[Tuple[float, float]], NegotiationMetrics]:
-        """협상 시뮬레이션 실행"""
+        urgency: str,
+        verbose: bool = True
+    ) -> Tuple[List[LogEntry], Optional[Dict], List[int], List[Tuple[float, float]], List[Tuple[float, float]], NegotiationMetrics]:
+        """협상 시뮬레이션 실행
+
+        verbose=True(기본값)이면 로그는 모두 문자열이다.
+        verbose=False이면 라운드 로그를 문자열로 포맷하지 않고 (종류, 인자...) 튜플로 남기므로,
+        문자열 로그가 필요하면 반환된 로그에 반드시 format_log를 적용해야 한다.
+        """
         
         log = []
-        prices = []
-        effective_prices = []
+        # 라운드 수 상한이 정해져 있으므로 미리 할당해두고 채운 만큼만 반환
+        prices = [None] * Config.MAX_ROUNDS
+        effective_prices = [None] * Config.MAX_ROUNDS
+        filled = 0
         
         try:
             # 에이전트 생성
@@ -426,59 +550,53 @@ class NegotiationSimulator:
             
             log.append("협상 시작")
             
+            # 라운드마다 반복되는 속성/메서드 조회를 루프 밖에서 한 번만 수행
+            log_append = log.append
+            seller_make_offer, seller_respond = seller.make_offer, seller.respond
+            buyer_make_offer, buyer_respond = buyer.make_offer, buyer.respond
+            
             # 협상 진행
             for round_num in range(1, Config.MAX_ROUNDS + 1):
-                log.append(f"--- 라운드 {round_num} ---")
+                if verbose:
+                    log_append(f"--- 라운드 {round_num} ---")
+                else:
+                    log_append(("round", round_num))
                 
                 # 판매자 오퍼
-                seller_offer = seller.make_offer()
-                log.append(f"판매자 오퍼: 가격={seller_offer.price:.2f}, 수량={seller_offer.qty}, 납기={seller_offer.delivery}")
-                prices.append((seller_offer.price, buyer.offer_price))
-                effective_prices.append((seller_offer.calculate_effective_price(), buyer.offer_price))
+                seller_offer = seller_make_offer()
+                seller_eff = seller_offer.calculate_effective_price()
+                if verbose:
+                    log_append(f"판매자 오퍼: 가격={seller_offer.price:.2f}, 수량={seller_offer.qty}, 납기={seller_offer.delivery}")
+                else:
+                    log_append(("seller_offer", seller_offer.price, seller_offer.qty, seller_offer.delivery))
+                prices[filled] = (seller_offer.price, buyer.offer_price)
+                effective_prices[filled] = (seller_eff, buyer.offer_price)
+                filled = round_num
                 
                 # 구매자 응답
-                buyer_response = buyer.respond(seller_offer)
+                buyer_response = buyer_respond(seller_offer, seller_eff)
                 if buyer_response == "accept":
-                    log.append("구매자가 판매자 오퍼를 수락했습니다!")
-                    final_offer = {
-                        "price": seller_offer.price,
-                        "qty": seller_offer.qty,
-                        "delivery": seller_offer.delivery,
-                        "payment_method": seller_offer.payment_method,
-                        "quality_grade": seller_offer.quality_grade,
-                        "warranty_months": seller_offer.warranty_months,
-                        "penalty_rate": seller_offer.penalty_rate,
-                        "discount_rate": seller_offer.discount_rate,
-                        "effective_price": seller_offer.calculate_effective_price(),
-                        "total_value": seller_offer.calculate_total_value()
-                    }
+                    log_append("구매자가 판매자 오퍼를 수락했습니다!")
+                    final_offer = _offer_to_result(seller_offer, seller_eff)
                     metrics = NegotiationAnalyzer.calculate_metrics(seller, buyer, final_offer, round_num)
-                    return log, final_offer, [round_num], prices, effective_prices, metrics
+                    return log, final_offer, [round_num], prices[:filled], effective_prices[:filled], metrics
                 
                 # 구매자 오퍼
-                buyer_offer = buyer.make_offer()
-                log.append(f"구매자 오퍼: 가격={buyer_offer.price:.2f}, 수량={buyer_offer.qty}, 납기={buyer_offer.delivery}")
+                buyer_offer = buyer_make_offer()
+                if verbose:
+                    log_append(f"구매자 오퍼: 가격={buyer_offer.price:.2f}, 수량={buyer_offer.qty}, 납기={buyer_offer.delivery}")
+                else:
+                    log_append(("buyer_offer", buyer_offer.price, buyer_offer.qty, buyer_offer.delivery))
                 
                 # 판매자 응답
-                seller_response = seller.respond(buyer_offer)
+                seller_response = seller_respond(buyer_offer)
                 if seller_response == "accept":
-                    log.append("판매자가 구매자 오퍼를 수락했습니다!")
-                    final_offer = {
-                        "price": buyer_offer.price,
-                        "qty": buyer_offer.qty,
-                        "delivery": buyer_offer.delivery,
-                        "payment_method": buyer_offer.payment_method,
-                        "quality_grade": buyer_offer.quality_grade,
-                        "warranty_months": buyer_offer.warranty_months,
-                        "penalty_rate": buyer_offer.penalty_rate,
-                        "discount_rate": buyer_offer.discount_rate,
-                        "effective_price": buyer_offer.calculate_effective_price(),
-                        "total_value": buyer_offer.calculate_total_value()
-                    }
+                    log_append("판매자가 구매자 오퍼를 수락했습니다!")
+                    final_offer = _offer_to_result(buyer_offer)
                     metrics = NegotiationAnalyzer.calculate_metrics(seller, buyer, final_offer, round_num)
-                    return log, final_offer, [round_num], prices, effective_prices, metrics
+                    return log, final_offer, [round_num], prices[:filled], effective_prices[:filled], metrics
                 
-                log.append("양측 모두 거부, 다음 라운드로 진행")
+                log_append("양측 모두 거부, 다음 라운드로 진행")
             
             # 최대 라운드 도달
             log.append("최대 라운드에 도달했습니다. 협상이 결렬되었습니다.")
@@ -486,6 +604,77 @@ class NegotiationSimulator:
             return log, None, [], prices, effective_prices, metrics
             
         except Exception as e:
-            logger.error(f"시뮬레이션 실행 중 오류: {str(e)}")
+            logger.error("시뮬레이션 실행 중 오류: %s", e)
             log.append(f"시뮬레이션 오류: {str(e)}")
-            return log, None, [], prices, effective_prices, NegotiationMetrics()
\ No newline at end of file
+            return log, None, [], prices[:filled], effective_prices[:filled], NegotiationMetrics()
+
+    @staticmethod
+    def simulate_batch(scenarios: List[Dict[str, Any]]) -> List[Tuple]:
+        """여러 시나리오 일괄 시뮬레이션 (파라미터 스윕용)
+
+        각 시나리오는 simulate_negotiation의 키워드 인자 dict이며,
+        결과는 입력 순서대로 simulate_negotiation의 반환 튜플 리스트로 돌려준다.
+        스윕에서는 로그를 보지 않는 경우가 많으므로 verbose=False로 실행한다.
+        시뮬레이션은 입력에 대해 결정적이므로 같은 시나리오는 한 번만 실행하고
+        같은 결과 튜플을 공유한다 (결과를 수정하려면 호출자가 복사해야 함).
+        """
+        simulate = NegotiationSimulator.simulate_negotiation
+        done: Dict[Tuple, Tuple] = {}
+        results = []
+        for scenario in scenarios:
+            key = tuple(sorted(
+                (name, tuple(value) if isinstance(value, list) else value)
+                for name, value in scenario.items()
+            ))
+            result = done.get(key)
+            if result is None:
+                result = done[key] = simulate(**scenario, verbose=False)
+            results.append(result)
+        return results
+
+    @staticmethod
+    def format_log(log: List[LogEntry]) -> List[str]:
+        """verbose=False로 기록된 로그를 문자열 로그로 변환"""
+        return [
+            entry if isinstance(entry, str) else _LOG_TEMPLATES[entry[0]].format(*entry[1:])
+            for entry in log
+        ]
+
+    @staticmethod
+    def simulate_negotiation_cached(
+        cost: float,
+        seller_target: float,
+        min_qty: int,
+        deliv_range: Tuple[int, int],
+        buyer_target: float,
+        buyer_qty: int,
+        buyer_deliv: int,
+        s_strategy: str,
+        b_strategy: str,
+        profit_margin: float,
+        budget_limit: float,
+        market_position: str,
+        urgency: str
+    ) -> Tuple[List[str], Optional[Dict], List[int], List[Tuple[float, float]], List[Tuple[float, float]], NegotiationMetrics]:
+        """캐시를 거치는 협상 시뮬레이션 (같은 입력이면 결과 재사용)
+
+        항상 verbose=True로 실행하므로 로그는 이미 문자열이다 (format_log 불필요).
+        시뮬레이션은 입력에 대해 결정적이므로 결과를 LRU 캐시에 보관한다.
+        호출자가 결과를 수정해도 캐시가 오염되지 않도록 컨테이너는 복사해서 돌려준다.
+        """
+        log, final_offer, rounds, prices, effective_prices, metrics = _simulate_cached(
+            cost, seller_target, min_qty, tuple(deliv_range), buyer_target, buyer_qty, buyer_deliv,
+            s_strategy, b_strategy, profit_margin, budget_limit, market_position, urgency
+        )
+        return (
+            list(log),
+            dict(final_offer) if final_offer is not None else None,
+            list(rounds),
+            list(prices),
+            list(effective_prices),
+            metrics
+        )
+
+@lru_cache(maxsize=4096)
+def _simulate_cached(*args) -> Tuple:
+    return NegotiationSimulator.simulate_negotiation(*args)
@@ -1,9 +1,12 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, validator
-from typing import Tuple, List, Optional, Dict, Any
+from fastapi.responses import Response
+from pydantic import BaseModel, Field, ValidationError, model_validator
+from typing import Annotated, Literal, Tuple, List, Optional, Dict, Any
+from dataclasses import fields
 import logging
 import traceback
+import orjson
 
 # 상대 import를 절대 import로 변경
 try:
@@ -19,6 +22,12 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 한 번의 /simulate_batch 요청에 담을 수 있는 최대 시나리오 수
+BATCH_MAX = 8
+
+# 응답 직렬화용 지표 필드명 (__dict__에 의존하지 않도록 import 시 한 번만 계산)
+_METRIC_FIELDS = tuple(f.name for f in fields(NegotiationMetrics))
+
 app = FastAPI(
     title="AI Negotiation Simulator",
     description="복합조건 협상 시뮬레이션 API",
@@ -35,60 +44,33 @@ app.add_middleware(
 )
 
 # 입력 데이터 구조
+# 제약 조건을 타입에 선언해 검증이 pydantic-core(Rust)에서 처리되도록 함
+PositiveFloat = Annotated[float, Field(gt=0)]
+PositiveInt = Annotated[int, Field(gt=0, strict=True)]
+DeliveryDay = Annotated[int, Field(ge=1, le=365, strict=True)]
+Strategy = Literal["aggressive", "conservative", "balanced"]
+
 class NegotiationInput(BaseModel):
-    cost: float
-    seller_target: float
-    min_qty: int
-    deliv_range: Tuple[int, int]
-    buyer_target: float
-    buyer_qty: int
-    buyer_deliv: int
-    s_strategy: str
-    b_strategy: str
-    profit_margin: float
-    budget_limit: float
-    market_position: str
-    urgency: str
-    
-    # 입력값 검증
-    @validator('cost', 'seller_target', 'buyer_target', 'profit_margin', 'budget_limit')
-    def validate_positive_numbers(cls, v):
-        if v <= 0:
-            raise ValueError('양수여야 합니다')
-        return v
+    cost: PositiveFloat
+    seller_target: PositiveFloat
+    min_qty: PositiveInt
+    deliv_range: Tuple[DeliveryDay, DeliveryDay]
+    buyer_target: PositiveFloat
+    buyer_qty: PositiveInt
+    buyer_deliv: PositiveInt
+    s_strategy: Strategy
+    b_strategy: Strategy
+    profit_margin: PositiveFloat
+    budget_limit: PositiveFloat
+    market_position: Literal["strong", "weak", "neutral"]
+    urgency: Literal["high", "medium", "low"]
     
-    @validator('min_qty', 'buyer_qty', 'buyer_deliv')
-    def validate_positive_integers(cls, v):
-        if v <= 0:
-            raise ValueError('양의 정수여야 합니다')
-        return v
-    
-    @validator('deliv_range')
-    def validate_delivery_range(cls, v):
-        if len(v) != 2 or v[0] > v[1]:
+    # 필드 간 검증
+    @model_validator(mode='after')
+    def validate_delivery_range(self):
+        if self.deliv_range[0] > self.deliv_range[1]:
             raise ValueError('배송 범위가 올바르지 않습니다 (시작일 <= 종료일)')
-        return v
-    
-    @validator('s_strategy', 'b_strategy')
-    def validate_strategy(cls, v):
-        valid_strategies = ['aggressive', 'conservative', 'balanced']
-        if v not in valid_strategies:
-            raise ValueError(f'전략은 {valid_strategies} 중 하나여야 합니다')
-        return v
-    
-    @validator('market_position')
-    def validate_market_position(cls, v):
-        valid_positions = ['strong', 'weak', 'neutral']
-        if v not in valid_positions:
-            raise ValueError(f'시장 위치는 {valid_positions} 중 하나여야 합니다')
-        return v
-    
-    @validator('urgency')
-    def validate_urgency(cls, v):
-        valid_urgency = ['high', 'medium', 'low']
-        if v not in valid_urgency:
-            raise ValueError(f'긴급도는 {valid_urgency} 중 하나여야 합니다')
-        return v
+        return self
 
 @app.get("/")
 def read_root():
@@ -100,76 +82,128 @@ def health_check():
     """헬스 체크 엔드포인트"""
     return {"status": "healthy", "version": "1.0.0"}
 
+class BatchInput(BaseModel):
+    # 항목별 검증은 simulate_batch에서 수행 (잘못된 한 건 때문에 전체가 422가 되지 않도록)
+    batch: List[Any] = Field(min_length=1, max_length=BATCH_MAX)
+
+def _orjson_response(payload: Dict[str, Any]) -> Response:
+    """로그/가격 배열이 많은 응답이므로 orjson으로 직접 직렬화해서 반환"""
+    return Response(
+        orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY),
+        media_type="application/json"
+    )
+
+def _run_negotiation(input_data: NegotiationInput) -> Dict[str, Any]:
+    """시뮬레이션 1건 실행 후 응답 dict 생성"""
+    # 시뮬레이션 실행
+    result = NegotiationSimulator.simulate_negotiation_cached(
+        cost=input_data.cost,
+        seller_target=input_data.seller_target,
+        min_qty=input_data.min_qty,
+        deliv_range=input_data.deliv_range,
+        buyer_target=input_data.buyer_target,
+        buyer_qty=input_data.buyer_qty,
+        buyer_deliv=input_data.buyer_deliv,
+        s_strategy=input_data.s_strategy,
+        b_strategy=input_data.b_strategy,
+        profit_margin=input_data.profit_margin,
+        budget_limit=input_data.budget_limit,
+        market_position=input_data.market_position,
+        urgency=input_data.urgency
+    )
+    
+    # 결과 언패킹 (반환값 개수에 따라 조정)
+    if len(result) == 6:
+        log, negotiation_result, rounds, prices, effective_prices, metrics = result
+    else:
+        # 예상과 다른 반환값 개수인 경우 처리
+        logger.warning("예상과 다른 반환값 개수: %d", len(result))
+        log, negotiation_result, rounds, prices, effective_prices, metrics = result[:6]
+    
+    # metrics 객체를 딕셔너리로 변환
+    metrics_dict = {name: getattr(metrics, name) for name in _METRIC_FIELDS}
+    
+    return {
+        "success": True,
+        "log": log if log else [],
+        "result": negotiation_result if negotiation_result else {},
+        "rounds": rounds if rounds else 0,
+        "prices": prices if prices else [],
+        "effective_prices": effective_prices if effective_prices else [],
+        "metrics": metrics_dict,
+    }
+
 @app.post("/simulate")
 def simulate(input_data: NegotiationInput):
     """협상 시뮬레이션 실행"""
     try:
-        logger.info(f"협상 시뮬레이션 시작: {input_data.dict()}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("협상 시뮬레이션 시작: %s", input_data.model_dump())
         
-        # 시뮬레이션 실행
-        result = NegotiationSimulator.simulate_negotiation(
-            cost=input_data.cost,
-            seller_target=input_data.seller_target,
-            min_qty=input_data.min_qty,
-            deliv_range=input_data.deliv_range,
-            buyer_target=input_data.buyer_target,
-            buyer_qty=input_data.buyer_qty,
-            buyer_deliv=input_data.buyer_deliv,
-            s_strategy=input_data.s_strategy,
-            b_strategy=input_data.b_strategy,
-            profit_margin=input_data.profit_margin,
-            budget_limit=input_data.budget_limit,
-            market_position=input_data.market_position,
-            urgency=input_data.urgency
-        )
-        
-        # 결과 언패킹 (반환값 개수에 따라 조정)
-        if len(result) == 6:
-            log, negotiation_result, rounds, prices, effective_prices, metrics = result
-        else:
-            # 예상과 다른 반환값 개수인 경우 처리
-            logger.warning(f"예상과 다른 반환값 개수: {len(result)}")
-            log, negotiation_result, rounds, prices, effective_prices, metrics = result[:6]
-        
-        # metrics 객체를 딕셔너리로 변환
-        metrics_dict = {}
-        if hasattr(metrics, '__dict__'):
-            metrics_dict = metrics.__dict__
-        elif isinstance(metrics, dict):
-            metrics_dict = metrics
-        
-        response = {
-            "success": True,
-            "log": log if log else [],
-            "result": negotiation_result if negotiation_result else {},
-            "rounds": rounds if rounds else 0,
-            "prices": prices if prices else [],
-            "effective_prices": effective_prices if effective_prices else [],
-            "metrics": metrics_dict,
-        }
+        response = _run_negotiation(input_data)
         
         logger.info("협상 시뮬레이션 완료")
-        return response
+        return _orjson_response(response)
         
     except ValueError as ve:
-        logger.error(f"입력값 오류: {str(ve)}")
+        logger.error("입력값 오류: %s", ve)
         raise HTTPException(status_code=400, detail=f"입력값 오류: {str(ve)}")
     
     except Exception as e:
-        logger.error(f"시뮬레이션 실행 중 오류: {str(e)}")
-        logger.error(f"상세 오류: {traceback.format_exc()}")
+        logger.error("시뮬레이션 실행 중 오류: %s", e)
+        logger.error("상세 오류: %s", traceback.format_exc())
+        raise HTTPException(
+            status_code=500, 
+            detail=f"시뮬레이션 실행 중 오류가 발생했습니다: {str(e)}"
+        )
+
+@app.post("/simulate_batch")
+def simulate_batch(input_data: BatchInput):
+    """여러 시나리오를 한 번의 요청으로 시뮬레이션
+
+    응답의 results는 batch 순서와 같다. 한 시나리오의 입력값 오류는
+    해당 항목만 success=False로 돌려주고 나머지는 그대로 실행한다.
+    """
+    logger.info("일괄 시뮬레이션 시작: %d건", len(input_data.batch))
+    results = []
+    try:
+        for raw_scenario in input_data.batch:
+            try:
+                scenario = NegotiationInput.model_validate(raw_scenario)
+            except ValidationError as ve:
+                # 어느 필드가 잘못됐는지 함께 표시 (모델 전체 검증 오류는 loc가 비어 있음)
+                messages = "; ".join(
+                    f'{".".join(map(str, error["loc"]))}: {error["msg"]}' if error["loc"] else error["msg"]
+                    for error in ve.errors()
+                )
+                logger.error("입력값 오류: %s", messages)
+                results.append({"success": False, "error": f"입력값 오류: {messages}"})
+                continue
+            
+            results.append(_run_negotiation(scenario))
+    
+    except Exception as e:
+        logger.error("일괄 시뮬레이션 실행 중 오류: %s", e)
+        logger.error("상세 오류: %s", traceback.format_exc())
         raise HTTPException(
             status_code=500, 
             detail=f"시뮬레이션 실행 중 오류가 발생했습니다: {str(e)}"
         )
+    
+    logger.info("일괄 시뮬레이션 완료")
+    return _orjson_response({"success": True, "results": results})
 
 # 개발 환경에서 직접 실행할 때
 if __name__ == "__main__":
+    import sys
     import uvicorn
     uvicorn.run(
         "main:app", 
         host="0.0.0.0", 
         port=8000, 
-        reload=True,
+        # 워커 하나로 시뮬레이션 LRU 캐시를 모든 요청이 공유
+        workers=1,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",  # uvloop은 Windows 미지원
+        http="httptools",
         log_level="info"
     )
\ No newline at end of file
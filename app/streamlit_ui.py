@@ -1,17 +1,16 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import pandas as pd
-import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import orjson
+import io
 import logging
+import math
+import time
 from typing import Dict, Tuple, List, Optional, Any
 from datetime import datetime, timedelta
 
-# 한글 폰트 설정
-plt.rcParams['font.family'] = ['DejaVu Sans', 'Malgun Gothic', 'Apple Gothic', 'sans-serif']
-plt.rcParams['axes.unicode_minus'] = False
-
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,10 +18,16 @@ logger = logging.getLogger(__name__)
 # API 설정
 API_BASE_URL = "http://localhost:8000"  # FastAPI 서버 주소
 SIMULATE_ENDPOINT = f"{API_BASE_URL}/simulate"
+BATCH_ENDPOINT = f"{API_BASE_URL}/simulate_batch"
+HEALTH_CHECK_TTL = 15  # 정상 응답을 재사용하는 시간 (초)
+SUBMIT_DEBOUNCE = 2.0  # 같은 입력의 연속 클릭을 하나로 묶는 시간 (초)
+JSON_HEADERS = {"Content-Type": "application/json"}
+CHART_DPI = 80  # 미리보기용 matplotlib 차트 해상도
 
 # 상수 정의 (API와 동일하게 유지)
 class Config:
     MAX_ROUNDS = 15
+    BATCH_MAX = 8  # /simulate_batch 한 번에 보낼 수 있는 최대 시나리오 수 (API와 동일)
     MIN_PRICE = 1
     MAX_PRICE = 100000
     MIN_QUANTITY = 1
@@ -50,23 +55,44 @@ class Config:
         "medium": "보통",
         "low": "여유"
     }
+    # 표시명 -> API 값 역조회 (클래스 로드 시 한 번만 생성)
+    STRATEGY_DISPLAY_INV = {v: k for k, v in STRATEGY_DISPLAY.items()}
+    MARKET_DISPLAY_INV = {v: k for k, v in MARKET_DISPLAY.items()}
+    URGENCY_DISPLAY_INV = {v: k for k, v in URGENCY_DISPLAY.items()}
+
+def get_http_session() -> requests.Session:
+    """keep-alive 연결을 재사용하는 HTTP 세션 (사용자 세션마다 한 번만 생성)
+
+    재시도는 시뮬레이션 호출에만 적용한다. 헬스 체크는 서버가 꺼져 있으면
+    재시도 대기 없이 바로 실패해야 하므로 기본 어댑터(재시도 없음)를 쓴다.
+    """
+    session = st.session_state.get("http")
+    if session is None:
+        session = requests.Session()
+        session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=0))
+        retry = Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+        retry_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retry)
+        session.mount(SIMULATE_ENDPOINT, retry_adapter)
+        session.mount(BATCH_ENDPOINT, retry_adapter)
+        st.session_state["http"] = session
+    return session
 
 def call_api(data: dict) -> dict:
     """FastAPI 서버 호출"""
     try:
-        logger.info(f"API 호출 시작: {SIMULATE_ENDPOINT}")
-        response = requests.post(
+        logger.info("API 호출 시작: %s", SIMULATE_ENDPOINT)
+        response = get_http_session().post(
             SIMULATE_ENDPOINT,
-            json=data,
-            headers={"Content-Type": "application/json"},
+            data=orjson.dumps(data),
+            headers=JSON_HEADERS,
             timeout=30
         )
         
         if response.status_code == 200:
             logger.info("API 호출 성공")
-            return response.json()
+            return orjson.loads(response.content)
         else:
-            logger.error(f"API 호출 실패: {response.status_code}, {response.text}")
+            logger.error("API 호출 실패: %s, %s", response.status_code, response.text)
             return {
                 "success": False,
                 "error": f"서버 오류 (HTTP {response.status_code}): {response.text}"
@@ -85,12 +111,127 @@ def call_api(data: dict) -> dict:
             "error": "서버 응답 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."
         }
     except Exception as e:
-        logger.error(f"API 호출 중 예외 발생: {str(e)}")
+        logger.error("API 호출 중 예외 발생: %s", e)
         return {
             "success": False,
             "error": f"예상치 못한 오류가 발생했습니다: {str(e)}"
         }
 
+async def _simulate_many(payloads: List[dict]) -> List[Any]:
+    """여러 시뮬레이션 요청을 하나의 비동기 클라이언트로 동시에 전송"""
+    import asyncio
+    import httpx
+    
+    limits = httpx.Limits(max_keepalive_connections=10)
+    async with httpx.AsyncClient(base_url=API_BASE_URL, timeout=30.0, limits=limits) as client:
+        return await asyncio.gather(
+            *[client.post("/simulate", content=orjson.dumps(payload), headers=JSON_HEADERS)
+              for payload in payloads],
+            return_exceptions=True
+        )
+
+def call_api_many(payloads: List[dict]) -> List[dict]:
+    """FastAPI 서버 동시 호출 (전략 비교 등 여러 시나리오용)
+
+    응답 순서는 payloads 순서와 같고, 각 항목은 call_api와 같은 형태의 dict이다.
+    """
+    # /simulate_batch가 없을 때만 쓰는 경로이므로 필요할 때 임포트
+    import asyncio
+    import httpx
+    
+    logger.info("API 동시 호출 시작: %d건", len(payloads))
+    results = []
+    for response in asyncio.run(_simulate_many(payloads)):
+        if isinstance(response, httpx.ConnectError):
+            results.append({
+                "success": False,
+                "error": "API 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인해주세요."
+            })
+        elif isinstance(response, httpx.TimeoutException):
+            results.append({
+                "success": False,
+                "error": "서버 응답 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."
+            })
+        elif isinstance(response, Exception):
+            results.append({
+                "success": False,
+                "error": f"예상치 못한 오류가 발생했습니다: {str(response)}"
+            })
+        elif response.status_code == 200:
+            results.append(orjson.loads(response.content))
+        else:
+            logger.error("API 호출 실패: %s, %s", response.status_code, response.text)
+            results.append({
+                "success": False,
+                "error": f"서버 오류 (HTTP {response.status_code}): {response.text}"
+            })
+    return results
+
+def call_api_batch(payloads: List[dict]) -> List[dict]:
+    """여러 시나리오를 /simulate_batch 한 번의 요청으로 실행
+
+    서버에 일괄 엔드포인트가 없으면(404) call_api_many로 개별 요청을 동시에 보낸다.
+    """
+    try:
+        logger.info("일괄 API 호출 시작: %s (%d건)", BATCH_ENDPOINT, len(payloads))
+        response = get_http_session().post(
+            BATCH_ENDPOINT,
+            data=orjson.dumps({"batch": payloads}),
+            headers=JSON_HEADERS,
+            timeout=30
+        )
+    except requests.exceptions.RequestException as e:
+        logger.error("일괄 API 호출 실패: %s", e)
+        error = {"success": False, "error": "API 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인해주세요."}
+        return [error] * len(payloads)
+    
+    if response.status_code == 404:
+        logger.info("일괄 엔드포인트 없음 - 개별 동시 호출로 대체")
+        return call_api_many(payloads)
+    if response.status_code != 200:
+        logger.error("일괄 API 호출 실패: %s, %s", response.status_code, response.text)
+        error = {"success": False, "error": f"서버 오류 (HTTP {response.status_code}): {response.text}"}
+        return [error] * len(payloads)
+    return orjson.loads(response.content)["results"]
+
+class SimulationApiError(Exception):
+    """실패한 API 응답을 캐시하지 않고 호출자에게 전달하기 위한 예외"""
+    def __init__(self, response: dict):
+        super().__init__(response.get("error", ""))
+        self.response = response
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def run_simulation(payload_json: str) -> dict:
+    """시뮬레이션 API 호출 (같은 입력이면 캐시된 응답 재사용)
+
+    payload_json은 sort_keys=True로 직렬화한 입력값으로, 캐시 키 역할을 한다.
+    실패 응답은 예외로 빠져나가 캐시되지 않는다.
+    """
+    response = call_api(json.loads(payload_json))
+    if not response.get("success", True):
+        raise SimulationApiError(response)
+    return response
+
+def check_api_health() -> Optional[bool]:
+    """API 서버 상태 확인 (True: 정상, False: 응답 오류, None: 연결 불가)
+
+    정상 응답은 HEALTH_CHECK_TTL 동안 session_state에 보관해 rerun마다 요청하지 않는다.
+    실패는 캐시하지 않으므로 서버가 뜨면 다음 rerun에서 바로 반영된다.
+    """
+    checked_at = st.session_state.get("_health_ok_at")
+    if checked_at is not None and time.monotonic() - checked_at < HEALTH_CHECK_TTL:
+        return True
+    
+    try:
+        health_check = get_http_session().get(f"{API_BASE_URL}/health", timeout=2)
+    except requests.exceptions.RequestException:
+        return None
+    
+    if health_check.status_code == 200:
+        st.session_state["_health_ok_at"] = time.monotonic()
+        return True
+    return False
+
 def validate_inputs(cost, seller_target, min_qty, deliv_start, deliv_end, 
                    buyer_target, budget_limit, buyer_qty, buyer_deliv, profit_margin):
     """입력값 검증"""
@@ -116,164 +257,350 @@ def validate_inputs(cost, seller_target, min_qty, deliv_start, deliv_end,
     
     return errors
 
+# --- 지연 임포트 (차트/표를 그릴 때만 무거운 라이브러리 로드) ---
+_matplotlib_ready = False
+
+def init_matplotlib():
+    """matplotlib을 처음 필요할 때 로드하고 폰트를 한 번만 설정
+
+    pyplot은 쓰지 않는다: Figure를 직접 만들어 Agg 캔버스에 붙이므로
+    pyplot의 전역 Figure 레지스트리에 남는 Figure가 없다.
+    """
+    global _matplotlib_ready
+    if not _matplotlib_ready:
+        import matplotlib
+        
+        # 한글 폰트 설정
+        matplotlib.rcParams['font.family'] = ['DejaVu Sans', 'Malgun Gothic', 'Apple Gothic', 'sans-serif']
+        matplotlib.rcParams['axes.unicode_minus'] = False
+        _matplotlib_ready = True
+
+def new_agg_figure(figsize: Tuple[float, float]):
+    """Agg 캔버스가 붙은 새 Figure 생성 (session_state에 저장하지 않음)
+
+    차트 렌더링 함수는 st.cache_data로 PNG를 캐시하므로 Figure는 캐시 미스일 때만
+    만들어지고, 함수가 끝나면 참조가 사라져 메모리에서 해제된다.
+    """
+    init_matplotlib()
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    
+    fig = Figure(figsize=figsize, dpi=CHART_DPI)
+    FigureCanvasAgg(fig)  # 서버 측 PNG 렌더링 전용 캔버스
+    return fig
+
+def _figure_to_png(fig) -> bytes:
+    """Figure를 PNG 바이트로 변환"""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=CHART_DPI, bbox_inches="tight")
+    return buffer.getvalue()
+
+def build_price_figures(rounds, prices, effective_prices):
+    """가격 변화 Plotly 차트 생성 (렌더링은 브라우저에서 수행)
+
+    prices/effective_prices는 (라운드 수, 2) 모양의 배열 (판매자, 구매자 순)
+    """
+    import plotly.graph_objects as go
+    
+    # 명목 가격 변화
+    nominal_fig = go.Figure()
+    nominal_fig.add_trace(go.Scatter(
+        x=rounds, y=prices[:, 0], name="판매자 제안가 (명목)", mode="lines+markers",
+        line=dict(color='#FF6B6B', width=3), marker=dict(symbol="circle", size=8)))
+    nominal_fig.add_trace(go.Scatter(
+        x=rounds, y=prices[:, 1], name="구매자 제안가 (명목)", mode="lines+markers",
+        line=dict(color='#4ECDC4', width=3), marker=dict(symbol="square", size=8)))
+    nominal_fig.update_layout(title="📊 명목 가격 협상 진행 과정",
+                              xaxis_title="협상 라운드", yaxis_title="명목 단가 (원)")
+    
+    # 실질 가격 변화
+    effective_fig = None
+    if effective_prices is not None:
+        effective_fig = go.Figure()
+        effective_fig.add_trace(go.Scatter(
+            x=rounds, y=effective_prices[:, 0], name="판매자 실질가격", mode="lines+markers",
+            line=dict(color='#FF8E53', width=3, dash="dash"),
+            marker=dict(symbol="triangle-up", size=8)))
+        effective_fig.add_trace(go.Scatter(
+            x=rounds, y=effective_prices[:, 1], name="구매자 실질가격", mode="lines+markers",
+            line=dict(color='#95E1D3', width=3, dash="dash"),
+            marker=dict(symbol="triangle-down", size=8)))
+        effective_fig.update_layout(title="💎 실질 가격 협상 진행 과정",
+                                    xaxis_title="협상 라운드", yaxis_title="실질 단가 (원)")
+    
+    return nominal_fig, effective_fig
+
+def build_performance_figures(metrics):
+    """성과 분석 Plotly 차트 생성 (만족도 막대, 거래 품질 막대, 결과 유형 원형)"""
+    import plotly.graph_objects as go
+    
+    # 만족도 비교
+    satisfaction_data = [metrics.get('seller_satisfaction', 0), 
+                         metrics.get('buyer_satisfaction', 0)]
+    satisfaction_fig = go.Figure(go.Bar(
+        x=['판매자', '구매자'], y=satisfaction_data, marker_color=['#FF6B6B', '#4ECDC4'],
+        opacity=0.8, width=0.6, text=[f'{value:.1f}%' for value in satisfaction_data],
+        textposition="outside"))
+    satisfaction_fig.update_layout(title="🎯 양측 만족도 비교", yaxis_title="만족도 (%)",
+                                   yaxis_range=[0, 110])
+    
+    # 위험도 및 신뢰도
+    risk_data = [100-metrics.get('risk_score', 0), 
+                 metrics.get('delivery_reliability', 0), 
+                 metrics.get('price_competitiveness', 0)]
+    quality_fig = go.Figure(go.Bar(
+        x=['안전도', '납기신뢰도', '가격경쟁력'], y=risk_data,
+        marker_color=['#95E1D3', '#F8B500', '#A8E6CF'], opacity=0.8,
+        text=[f'{value:.1f}' for value in risk_data], textposition="outside"))
+    quality_fig.update_layout(title="📊 거래 품질 지표", yaxis_title="점수",
+                              yaxis_range=[0, 110])
+    
+    # Win-Win 점수 원형 차트
+    win_win_score = metrics.get('win_win_score', 0)
+    outcome_fig = go.Figure(go.Pie(
+        values=[win_win_score, 100-win_win_score], labels=['Win-Win', 'Win-Lose'],
+        marker_colors=['#4ECDC4', '#FFB6C1'], sort=False, direction="counterclockwise",
+        textinfo="label+percent"))
+    outcome_fig.update_layout(title="🤝 협상 결과 유형")
+    
+    return satisfaction_fig, quality_fig, outcome_fig
+
+def build_convergence_figure(rounds, prices):
+    """가격 격차 수렴 Plotly 차트 생성"""
+    import numpy as np
+    import plotly.graph_objects as go
+    
+    price_gap = np.abs(prices[:, 0] - prices[:, 1])
+    fig = go.Figure(go.Scatter(
+        x=rounds, y=price_gap, name="가격 격차", mode="lines+markers", fill="tozeroy",
+        line=dict(color='#FF6B6B', width=3), marker=dict(size=8)))
+    fig.update_layout(title="📉 가격 격차 수렴 과정",
+                      xaxis_title="협상 라운드", yaxis_title="가격 격차 (원)")
+    return fig
+
+# 레이더 차트 축 (고정 4개 항목). 마지막 각도(2π)가 첫 점과 겹치도록 다각형을 닫는다
+_EFFICIENCY_FACTORS = ('속도', '만족도', '안정성', '경제성')
+_RADAR_ANGLES = tuple(i * (2 * math.pi / len(_EFFICIENCY_FACTORS))
+                      for i in range(len(_EFFICIENCY_FACTORS) + 1))
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def render_radar_chart(round_count, metrics) -> bytes:
+    """협상 효율성 레이더 차트 렌더링 (같은 입력이면 캐시된 PNG 재사용)"""
+    import numpy as np
+    
+    fig = new_agg_figure((7, 6))
+    
+    # 협상 효율성 레이더 차트
+    speed_score = max(0, 100 - round_count * 5)
+    satisfaction_score = metrics.get('win_win_score', 0)
+    stability_score = 100 - metrics.get('risk_score', 0)
+    economics_score = metrics.get('price_competitiveness', 0)
+    
+    efficiency_scores = np.array([speed_score, satisfaction_score, 
+                                  stability_score, economics_score], dtype=np.float64)
+    efficiency_scores = np.concatenate([efficiency_scores, efficiency_scores[:1]])
+    
+    ax = fig.add_subplot(111, projection='polar')
+    ax.plot(_RADAR_ANGLES, efficiency_scores, 'o-', linewidth=3, 
+            color='#4ECDC4', markersize=8)
+    ax.fill(_RADAR_ANGLES, efficiency_scores, alpha=0.25, color='#4ECDC4')
+    ax.set_xticks(_RADAR_ANGLES[:-1])
+    ax.set_xticklabels(_EFFICIENCY_FACTORS, fontsize=11)
+    ax.set_ylim(0, 100)
+    ax.set_title('🎯 협상 효율성 레이더', fontsize=14, 
+                 fontweight='bold', pad=20)
+    ax.grid(True)
+    
+    fig.tight_layout()
+    return _figure_to_png(fig)
+
 def create_charts(result, metrics, rounds, prices, effective_prices):
     """차트 생성 함수"""
+    import numpy as np
+    
     try:
         if not prices or not rounds:
             st.warning("차트를 생성할 데이터가 충분하지 않습니다.")
             return
         
+        # 라운드별 (판매자, 구매자) 가격을 한 번에 배열로 변환
+        prices_arr = np.asarray(prices, dtype=np.float64)
+        eff_arr = np.asarray(effective_prices, dtype=np.float64) if effective_prices else None
+        # API의 rounds는 종료 라운드 번호만 담고 있으므로 x축은 가격 기록 길이로 만든다
+        round_axis = np.arange(1, len(prices_arr) + 1)
+        
         # 탭으로 구분
         tab1, tab2, tab3 = st.tabs(["💰 가격 변화", "📊 성과 분석", "🎯 협상 효율성"])
         
         with tab1:
-            fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
-            
-            # 명목 가격 변화
-            seller_p = [x[0] for x in prices]
-            buyer_p = [x[1] for x in prices]
-            
-            ax1.plot(rounds, seller_p, label="판매자 제안가 (명목)", marker="o", 
-                    linewidth=3, color='#FF6B6B', markersize=8)
-            ax1.plot(rounds, buyer_p, label="구매자 제안가 (명목)", marker="s", 
-                    linewidth=3, color='#4ECDC4', markersize=8)
-            ax1.set_xlabel("협상 라운드", fontsize=12)
-            ax1.set_ylabel("명목 단가 (원)", fontsize=12)
-            ax1.set_title("📊 명목 가격 협상 진행 과정", fontsize=14, fontweight='bold')
-            ax1.legend(fontsize=11)
-            ax1.grid(True, alpha=0.3)
-            
-            # 실질 가격 변화
-            if effective_prices:
-                seller_eff = [x[0] for x in effective_prices]
-                buyer_eff = [x[1] for x in effective_prices]
-                
-                ax2.plot(rounds, seller_eff, label="판매자 실질가격", marker="^", 
-                        linewidth=3, color='#FF8E53', markersize=8, linestyle='--')
-                ax2.plot(rounds, buyer_eff, label="구매자 실질가격", marker="v", 
-                        linewidth=3, color='#95E1D3', markersize=8, linestyle='--')
-                ax2.set_xlabel("협상 라운드", fontsize=12)
-                ax2.set_ylabel("실질 단가 (원)", fontsize=12)
-                ax2.set_title("💎 실질 가격 협상 진행 과정", fontsize=14, fontweight='bold')
-                ax2.legend(fontsize=11)
-                ax2.grid(True, alpha=0.3)
-            
-            plt.tight_layout()
-            st.pyplot(fig)
-            plt.close(fig)
+            nominal_fig, effective_fig = build_price_figures(round_axis, prices_arr, eff_arr)
+            st.plotly_chart(nominal_fig, use_container_width=True)
+            if effective_fig is not None:
+                st.plotly_chart(effective_fig, use_container_width=True)
         
         with tab2:
             if result:
-                # 성과 분석 차트
-                fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(14, 10))
-                
-                # 만족도 비교
-                satisfaction_data = [metrics.get('seller_satisfaction', 0), 
-                                   metrics.get('buyer_satisfaction', 0)]
-                satisfaction_labels = ['판매자', '구매자']
-                colors = ['#FF6B6B', '#4ECDC4']
-                
-                bars1 = ax1.bar(satisfaction_labels, satisfaction_data, color=colors, 
-                               alpha=0.8, width=0.6)
-                ax1.set_title('🎯 양측 만족도 비교', fontsize=14, fontweight='bold')
-                ax1.set_ylabel('만족도 (%)', fontsize=12)
-                ax1.set_ylim(0, 100)
-                
-                # 막대 위에 값 표시
-                for bar, value in zip(bars1, satisfaction_data):
-                    ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 1,
-                            f'{value:.1f}%', ha='center', va='bottom', fontweight='bold')
-                
-                # 위험도 및 신뢰도
-                risk_data = [100-metrics.get('risk_score', 0), 
-                           metrics.get('delivery_reliability', 0), 
-                           metrics.get('price_competitiveness', 0)]
-                risk_labels = ['안전도', '납기신뢰도', '가격경쟁력']
-                colors2 = ['#95E1D3', '#F8B500', '#A8E6CF']
-                
-                bars2 = ax2.bar(risk_labels, risk_data, color=colors2, alpha=0.8)
-                ax2.set_title('📊 거래 품질 지표', fontsize=14, fontweight='bold')
-                ax2.set_ylabel('점수', fontsize=12)
-                ax2.set_ylim(0, 100)
-                
-                for bar, value in zip(bars2, risk_data):
-                    ax2.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 1,
-                            f'{value:.1f}', ha='center', va='bottom', fontweight='bold')
-                
-                # Win-Win 점수 원형 차트
-                win_win_score = metrics.get('win_win_score', 0)
-                win_lose_data = [win_win_score, 100-win_win_score]
-                win_lose_labels = ['Win-Win', 'Win-Lose']
-                colors3 = ['#4ECDC4', '#FFB6C1']
-                
-                wedges, texts, autotexts = ax3.pie(win_lose_data, labels=win_lose_labels, 
-                                                  colors=colors3, autopct='%1.1f%%', 
-                                                  startangle=90)
-                ax3.set_title('🤝 협상 결과 유형', fontsize=14, fontweight='bold')
+                satisfaction_fig, quality_fig, outcome_fig = build_performance_figures(metrics)
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.plotly_chart(satisfaction_fig, use_container_width=True)
+                with col2:
+                    st.plotly_chart(quality_fig, use_container_width=True)
                 
-                # 총 거래가치 표시
-                total_value = result.get('total_value', 0)
-                ax4.text(0.5, 0.6, f'💎 총 거래금액', ha='center', va='center', 
-                        fontsize=16, fontweight='bold', transform=ax4.transAxes)
-                ax4.text(0.5, 0.4, f'{total_value:,.0f}원', ha='center', va='center', 
-                        fontsize=24, fontweight='bold', color='#2E8B57', 
-                        transform=ax4.transAxes)
-                ax4.text(0.5, 0.2, f'단가: {result.get("effective_price", 0):,.0f}원 × 수량: {result.get("qty", 0):,}개', 
-                        ha='center', va='center', fontsize=12, transform=ax4.transAxes)
-                ax4.axis('off')
-                
-                plt.tight_layout()
-                st.pyplot(fig)
-                plt.close(fig)
+                col3, col4 = st.columns(2)
+                with col3:
+                    st.plotly_chart(outcome_fig, use_container_width=True)
+                with col4:
+                    # 총 거래가치 표시
+                    st.metric(
+                        "💎 총 거래금액", f"{result.get('total_value', 0):,.0f}원",
+                        delta=f"단가 {result.get('effective_price', 0):,.0f}원 × 수량 {result.get('qty', 0):,}개",
+                        delta_color="off"
+                    )
         
         with tab3:
-            if result and len(rounds) > 1:
-                # 협상 효율성 분석
-                fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-                
-                # 가격 수렴 패턴
-                price_gap = [abs(s - b) for s, b in prices]
-                ax1.plot(rounds, price_gap, marker='o', linewidth=3, 
-                        color='#FF6B6B', markersize=8)
-                ax1.fill_between(rounds, price_gap, alpha=0.3, color='#FF6B6B')
-                ax1.set_xlabel('협상 라운드', fontsize=12)
-                ax1.set_ylabel('가격 격차 (원)', fontsize=12)
-                ax1.set_title('📉 가격 격차 수렴 과정', fontsize=14, fontweight='bold')
-                ax1.grid(True, alpha=0.3)
-                
-                # 협상 효율성 레이더 차트
-                efficiency_factors = ['속도', '만족도', '안정성', '경제성']
-                speed_score = max(0, 100 - len(rounds) * 5)
-                satisfaction_score = metrics.get('win_win_score', 0)
-                stability_score = 100 - metrics.get('risk_score', 0)
-                economics_score = metrics.get('price_competitiveness', 0)
-                
-                efficiency_scores = [speed_score, satisfaction_score, 
-                                   stability_score, economics_score]
-                
-                angles = np.linspace(0, 2 * np.pi, len(efficiency_factors), 
-                                   endpoint=False).tolist()
-                efficiency_scores += efficiency_scores[:1]
-                angles += angles[:1]
-                
-                ax2 = plt.subplot(122, projection='polar')
-                ax2.plot(angles, efficiency_scores, 'o-', linewidth=3, 
-                        color='#4ECDC4', markersize=8)
-                ax2.fill(angles, efficiency_scores, alpha=0.25, color='#4ECDC4')
-                ax2.set_xticks(angles[:-1])
-                ax2.set_xticklabels(efficiency_factors, fontsize=11)
-                ax2.set_ylim(0, 100)
-                ax2.set_title('🎯 협상 효율성 레이더', fontsize=14, 
-                             fontweight='bold', pad=20)
-                ax2.grid(True)
-                
-                plt.tight_layout()
-                st.pyplot(fig)
-                plt.close(fig)
+            if result and len(round_axis) > 1:
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.plotly_chart(build_convergence_figure(round_axis, prices_arr),
+                                    use_container_width=True)
+                with col2:
+                    st.image(render_radar_chart(len(round_axis), metrics))
     
     except Exception as e:
         st.error(f"차트 생성 중 오류가 발생했습니다: {str(e)}")
-        logger.error(f"차트 생성 오류: {str(e)}")
+        logger.error("차트 생성 오류: %s", e)
+
+def render_results(input_key: str):
+    """마지막 시뮬레이션 결과 및 차트 표시
+
+    결과는 실행 당시 입력값의 키(input_key)와 함께 session_state에 보관된다.
+    입력 위젯을 바꾸면 키가 달라지므로 지난 결과와 차트를 다시 그리지 않고
+    안내 문구만 표시한다.
+    """
+    api_response = st.session_state.get("last_response")
+    if not api_response:
+        return
+    if st.session_state.get("last_response_key") != input_key:
+        st.info("ℹ️ 입력값이 변경되었습니다. '협상 시작'을 눌러 결과를 갱신하세요.")
+        return
+    
+    # API 응답 처리
+    if api_response.get("success", True):  # success 키가 없으면 True로 가정
+        result = api_response.get("result")
+        log = api_response.get("log", [])
+        rounds = api_response.get("rounds", [])
+        prices = api_response.get("prices", [])
+        effective_prices = api_response.get("effective_prices", [])
+        metrics = api_response.get("metrics", {})
+        
+        # 결과 표시
+        if result:
+            st.success("🎉 협상 성공!")
+            
+            # 핵심 성과 지표 (한 번의 dataframe 호출로 전송)
+            import pandas as pd
+            
+            summary_df = pd.DataFrame({
+                "지표": ["💰 최종 단가", "📦 최종 수량", "🚚 최종 납기", "🤝 Win-Win 점수"],
+                "값": [
+                    f"{result.get('price', 0):,.0f}원",
+                    f"{result.get('qty', 0):,}개",
+                    f"{result.get('delivery', 0)}일",
+                    f"{metrics.get('win_win_score', 0):.1f}점",
+                ],
+                "비고": [
+                    f"실질: {result.get('effective_price', 0):,.0f}원",
+                    f"총액: {result.get('total_value', 0):,.0f}원",
+                    f"페널티: {result.get('penalty_rate', 0)}%",
+                    "상호이익 달성도",
+                ],
+            })
+            st.dataframe(summary_df, use_container_width=True, hide_index=True)
+            
+            # 상세 협상 결과
+            st.subheader("📋 최종 계약 조건")
+            st.markdown(f"""
+            | 💰 가격 정보 | | 💳 결제 및 납기 | |
+            |---|---|---|---|
+            | 명목 단가 | {result.get('price', 0):,.0f}원 | 결제 조건 | {result.get('payment_method', '현금')} |
+            | 실질 단가 | {result.get('effective_price', 0):,.0f}원 | 납기일 | {result.get('delivery', 0)}일 |
+            | 총 계약금액 | {result.get('total_value', 0):,.0f}원 | 수량 | {result.get('qty', 0):,}개 |
+            | 대량할인 | {result.get('discount_rate', 0)}% | | |
+            | **📊 품질 및 보증** | | **📈 성과 분석** | |
+            | 품질 등급 | {result.get('quality_grade', '표준')} | 판매자 만족도 | {metrics.get('seller_satisfaction', 0):.1f}% |
+            | 보증 기간 | {result.get('warranty_months', 12)}개월 | 구매자 만족도 | {metrics.get('buyer_satisfaction', 0):.1f}% |
+            | 지연 페널티 | {result.get('penalty_rate', 0)}% | 위험 점수 | {metrics.get('risk_score', 0):.1f}점 |
+            """)
+            
+            # 협상 로그 표시
+            st.subheader("📜 협상 진행 과정")
+            with st.expander("상세 협상 로그 보기", expanded=False):
+                st.code("\n".join(log), language="text")
+            
+            # 차트 생성
+            if prices and rounds:
+                st.subheader("📈 협상 진행 과정 시각화")
+                create_charts(result, metrics, rounds, prices, effective_prices)
+        
+        else:
+            st.error("💔 협상 결렬 - 양측이 합의점을 찾지 못했습니다.")
+            st.info("🔍 조건을 조정하여 다시 시도해보세요.")
+            
+            # 실패 로그도 표시
+            if log:
+                with st.expander("협상 실패 과정 보기", expanded=False):
+                    st.code("\n".join(log), language="text")
+    
+    else:
+        # API 오류 처리
+        error_message = api_response.get("error", "알 수 없는 오류가 발생했습니다.")
+        st.error(f"❌ 시뮬레이션 실행 실패: {error_message}")
+
+
+def render_batch_section(api_data: dict):
+    """시나리오 대기열 관리 및 일괄 실행 결과 비교표 표시"""
+    queue = st.session_state.setdefault("scenario_queue", [])
+    
+    st.subheader("🧪 시나리오 비교")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("➕ 시나리오 추가", use_container_width=True,
+                     disabled=len(queue) >= Config.BATCH_MAX):
+            queue.append(dict(api_data))
+    with col2:
+        run_batch = st.button(f"▶️ 모두 실행 ({len(queue)}건)", use_container_width=True,
+                              disabled=not queue)
+    with col3:
+        if st.button("🗑️ 대기열 비우기", use_container_width=True, disabled=not queue):
+            queue.clear()
+            st.session_state.pop("batch_results", None)
+    st.caption(f"대기 중인 시나리오: {len(queue)} / {Config.BATCH_MAX}")
+    
+    if run_batch and queue:
+        with st.spinner("🔄 시나리오 일괄 협상 진행 중..."):
+            st.session_state.batch_results = (list(queue), call_api_batch(queue))
+    
+    batch = st.session_state.get("batch_results")
+    if not batch:
+        return
+    
+    import pandas as pd
+    
+    rows = []
+    for i, (scenario, response) in enumerate(zip(*batch), start=1):
+        result = response.get("result") or {}
+        metrics = response.get("metrics") or {}
+        rows.append({
+            "#": i,
+            "판매자 전략": Config.STRATEGY_DISPLAY.get(scenario["s_strategy"]),
+            "구매자 전략": Config.STRATEGY_DISPLAY.get(scenario["b_strategy"]),
+            "결과": "성공" if result else ("결렬" if response.get("success", True) else "오류"),
+            "최종 단가 (원)": result.get("price"),
+            "실질 단가 (원)": result.get("effective_price"),
+            "Win-Win 점수": metrics.get("win_win_score"),
+        })
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
 
 def main():
     st.set_page_config(
@@ -287,16 +614,15 @@ def main():
     st.markdown("복합조건을 고려한 실시간 협상 시뮬레이션")
     
     # API 서버 상태 확인
-    try:
-        health_check = requests.get(f"{API_BASE_URL}/health", timeout=5)
-        if health_check.status_code == 200:
-            st.success("✅ API 서버 연결됨")
-        else:
-            st.error("❌ API 서버 응답 오류")
-    except:
+    api_status = check_api_health()
+    if api_status:
+        st.success("✅ API 서버 연결됨")
+    elif api_status is None:
         st.error("❌ API 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인해주세요.")
         st.info("💡 터미널에서 `uvicorn api.main:app --reload` 명령으로 서버를 시작하세요.")
         return
+    else:
+        st.error("❌ API 서버 응답 오류")
     
     # 협상 가이드 표시
     with st.expander("📋 협상 시뮬레이션 가이드", expanded=False):
@@ -331,10 +657,11 @@ def main():
         
         with col1:
             st.subheader("🏪 판매자 정보")
-            cost = st.number_input("원가 (원)", min_value=1.0, max_value=100000.0, 
+            # 필드 간 제약(원가 < 목표 단가)은 min_value로 위젯에서 바로 강제
+            cost = st.number_input("원가 (원)", min_value=1.0, max_value=100000.0 - 1.0, 
                                   value=800.0, step=1.0, key="seller_cost")
-            seller_target = st.number_input("목표 단가 (원)", min_value=cost, 
-                                          max_value=100000.0, value=max(1200.0, cost), 
+            seller_target = st.number_input("목표 단가 (원)", min_value=cost + 1.0, 
+                                          max_value=100000.0, value=max(1200.0, cost + 1.0), 
                                           step=1.0, key="seller_target")
             profit_margin = st.slider("목표 이익률 (%)", min_value=5.0, max_value=50.0, 
                                     value=20.0, step=1.0, key="profit_margin")
@@ -354,23 +681,22 @@ def main():
             market_display = st.selectbox("시장 지위", 
                                         list(Config.MARKET_DISPLAY.values()), 
                                         index=2, key="market_position")
-            market_position = [k for k, v in Config.MARKET_DISPLAY.items() 
-                             if v == market_display][0]
+            market_position = Config.MARKET_DISPLAY_INV[market_display]
             
             s_strategy_display = st.selectbox("판매자 협상전략", 
                                             list(Config.STRATEGY_DISPLAY.values()), 
                                             index=0, key="s_strategy")
-            s_strategy = [k for k, v in Config.STRATEGY_DISPLAY.items() 
-                         if v == s_strategy_display][0]
+            s_strategy = Config.STRATEGY_DISPLAY_INV[s_strategy_display]
         
         with col2:
             st.subheader("🛒 구매자 정보")
+            # 필드 간 제약(목표 단가 < 예산 한도)은 min_value로 위젯에서 바로 강제
             buyer_target = st.number_input("목표 단가 (원)", min_value=1.0, 
-                                         max_value=100000.0, value=1000.0, 
+                                         max_value=100000.0 - 1.0, value=1000.0, 
                                          step=1.0, key="buyer_target")
-            budget_limit = st.number_input("예산 한도 (원)", min_value=buyer_target, 
+            budget_limit = st.number_input("예산 한도 (원)", min_value=buyer_target + 1.0, 
                                          max_value=100000.0, 
-                                         value=max(1500.0, buyer_target), 
+                                         value=max(1500.0, buyer_target + 1.0), 
                                          step=1.0, key="budget_limit")
             buyer_qty = st.number_input("목표 수량 (개)", min_value=1, max_value=100000, 
                                       value=1000, step=1, key="buyer_qty")
@@ -380,14 +706,12 @@ def main():
             urgency_display = st.selectbox("구매 긴급도", 
                                          list(Config.URGENCY_DISPLAY.values()), 
                                          index=1, key="urgency")
-            urgency = [k for k, v in Config.URGENCY_DISPLAY.items() 
-                      if v == urgency_display][0]
+            urgency = Config.URGENCY_DISPLAY_INV[urgency_display]
             
             b_strategy_display = st.selectbox("구매자 협상전략", 
                                             list(Config.STRATEGY_DISPLAY.values()), 
                                             index=1, key="b_strategy")
-            b_strategy = [k for k, v in Config.STRATEGY_DISPLAY.items() 
-                         if v == b_strategy_display][0]
+            b_strategy = Config.STRATEGY_DISPLAY_INV[b_strategy_display]
         
         # 전략 설명
         strategy_desc = {
@@ -399,7 +723,7 @@ def main():
         col1.caption(f"선택 전략: {strategy_desc.get(s_strategy_display, '')}")
         col2.caption(f"선택 전략: {strategy_desc.get(b_strategy_display, '')}")
         
-        # 입력값 검증
+        # 입력값 검증 (위젯 제약으로 이미 보장되며, 최종 안전장치로만 유지)
         validation_errors = validate_inputs(
             cost, seller_target, min_qty, deliv_start, deliv_end,
             buyer_target, budget_limit, buyer_qty, buyer_deliv, profit_margin
@@ -412,117 +736,56 @@ def main():
             return
         
         # 시뮬레이션 실행
+        # API 호출 데이터 준비
+        api_data = {
+            "cost": cost,
+            "seller_target": seller_target,
+            "min_qty": min_qty,
+            "deliv_range": [deliv_start, deliv_end],
+            "buyer_target": buyer_target,
+            "buyer_qty": buyer_qty,
+            "buyer_deliv": buyer_deliv,
+            "s_strategy": s_strategy,
+            "b_strategy": b_strategy,
+            "profit_margin": profit_margin,
+            "budget_limit": budget_limit,
+            "market_position": market_position,
+            "urgency": urgency
+        }
+        
+        input_key = json.dumps(api_data, sort_keys=True)
+        
+        force_rerun = st.checkbox("강제 재실행 (캐시된 결과 무시)", value=False, key="force_rerun")
         if st.button("🚀 협상 시작", type="primary", use_container_width=True):
-            st.session_state.simulation_count += 1
-            
-            # API 호출 데이터 준비
-            api_data = {
-                "cost": cost,
-                "seller_target": seller_target,
-                "min_qty": min_qty,
-                "deliv_range": [deliv_start, deliv_end],
-                "buyer_target": buyer_target,
-                "buyer_qty": buyer_qty,
-                "buyer_deliv": buyer_deliv,
-                "s_strategy": s_strategy,
-                "b_strategy": b_strategy,
-                "profit_margin": profit_margin,
-                "budget_limit": budget_limit,
-                "market_position": market_position,
-                "urgency": urgency
-            }
-            
-            with st.spinner("🔄 협상 진행 중... AI가 복잡한 조건들을 분석하고 있습니다."):
-                api_response = call_api(api_data)
-            
-            # API 응답 처리
-            if api_response.get("success", True):  # success 키가 없으면 True로 가정
-                result = api_response.get("result")
-                log = api_response.get("log", [])
-                rounds = api_response.get("rounds", [])
-                prices = api_response.get("prices", [])
-                effective_prices = api_response.get("effective_prices", [])
-                metrics = api_response.get("metrics", {})
+            # 같은 입력으로 직전 요청 직후에 다시 들어온 클릭(더블클릭 등)은
+            # 새 POST를 보내지 않고 기존 결과를 그대로 사용
+            last_submit = st.session_state.get("_last_submit")
+            if (last_submit is None or last_submit[0] != input_key
+                    or time.monotonic() - last_submit[1] >= SUBMIT_DEBOUNCE):
+                st.session_state.simulation_count += 1
                 
-                # 결과 표시
-                if result:
-                    st.success("🎉 협상 성공!")
-                    
-                    # 핵심 성과 지표
-                    col1, col2, col3, col4 = st.columns(4)
-                    with col1:
-                        st.metric("💰 최종 단가", f"{result.get('price', 0):,.0f}원", 
-                                 delta=f"실질: {result.get('effective_price', 0):,.0f}원")
-                    with col2:
-                        st.metric("📦 최종 수량", f"{result.get('qty', 0):,}개", 
-                                 delta=f"총액: {result.get('total_value', 0):,.0f}원")
-                    with col3:
-                        st.metric("🚚 최종 납기", f"{result.get('delivery', 0)}일", 
-                                 delta=f"페널티: {result.get('penalty_rate', 0)}%")
-                    with col4:
-                        st.metric("🤝 Win-Win 점수", f"{metrics.get('win_win_score', 0):.1f}점", 
-                                 delta="상호이익 달성도")
-                    
-                    # 상세 협상 결과
-                    st.subheader("📋 최종 계약 조건")
-                    result_col1, result_col2 = st.columns(2)
-                    
-                    with result_col1:
-                        st.markdown(f"""
-                        **💰 가격 정보**
-                        - 명목 단가: {result.get('price', 0):,.0f}원
-                        - 실질 단가: {result.get('effective_price', 0):,.0f}원
-                        - 총 계약금액: {result.get('total_value', 0):,.0f}원
-                        - 대량할인: {result.get('discount_rate', 0)}%
-                        
-                        **📊 품질 및 보증**
-                        - 품질 등급: {result.get('quality_grade', '표준')}
-                        - 보증 기간: {result.get('warranty_months', 12)}개월
-                        - 지연 페널티: {result.get('penalty_rate', 0)}%
-                        """)
-                    
-                    with result_col2:
-                        st.markdown(f"""
-                        **💳 결제 및 납기**
-                        - 결제 조건: {result.get('payment_method', '현금')}
-                        - 납기일: {result.get('delivery', 0)}일
-                        - 수량: {result.get('qty', 0):,}개
-                        
-                        **📈 성과 분석**
-                        - 판매자 만족도: {metrics.get('seller_satisfaction', 0):.1f}%
-                        - 구매자 만족도: {metrics.get('buyer_satisfaction', 0):.1f}%
-                        - 위험 점수: {metrics.get('risk_score', 0):.1f}점
-                        """)
-                    
-                    # 협상 로그 표시
-                    st.subheader("📜 협상 진행 과정")
-                    with st.expander("상세 협상 로그 보기", expanded=False):
-                        for line in log:
-                            st.write(line)
-                    
-                    # 차트 생성
-                    if prices and rounds:
-                        st.subheader("📈 협상 진행 과정 시각화")
-                        create_charts(result, metrics, rounds, prices, effective_prices)
+                with st.spinner("🔄 협상 진행 중... AI가 복잡한 조건들을 분석하고 있습니다."):
+                    if force_rerun:
+                        api_response = call_api(api_data)
+                    else:
+                        try:
+                            api_response = run_simulation(input_key)
+                        except SimulationApiError as e:
+                            api_response = e.response
                 
-                else:
-                    st.error("💔 협상 결렬 - 양측이 합의점을 찾지 못했습니다.")
-                    st.info("🔍 조건을 조정하여 다시 시도해보세요.")
-                    
-                    # 실패 로그도 표시
-                    if log:
-                        with st.expander("협상 실패 과정 보기", expanded=False):
-                            for line in log:
-                                st.write(line)
-            
-            else:
-                # API 오류 처리
-                error_message = api_response.get("error", "알 수 없는 오류가 발생했습니다.")
-                st.error(f"❌ 시뮬레이션 실행 실패: {error_message}")
+                st.session_state._last_submit = (input_key, time.monotonic())
+                st.session_state.last_response = api_response
+                st.session_state.last_response_key = input_key
+        
+        # 결과 표시 (현재 입력값으로 실행한 결과일 때만)
+        render_results(input_key)
+        
+        # 시나리오 일괄 비교
+        render_batch_section(api_data)
     
     except Exception as e:
         st.error(f"애플리케이션 오류가 발생했습니다: {str(e)}")
-        logger.error(f"UI 오류: {str(e)}")
+        logger.error("UI 오류: %s", e)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
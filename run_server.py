@@ -4,34 +4,51 @@ AI 협상 시뮬레이터 서버 실행 스크립트
 FastAPI 서버를 백그라운드에서 실행하고 Streamlit 앱을 시작합니다.
 """
 
+import argparse
+import atexit
+import http.client
+import importlib.util
 import subprocess
 import time
 import sys
 import os
 import signal
-import requests
+import socket
 from pathlib import Path
 
+try:
+    import psutil
+except ImportError:  # 선택 의존성: 없으면 /proc 기반으로 대체
+    psutil = None
+
 # 프로젝트 루트 디렉토리 설정
 PROJECT_ROOT = Path(__file__).parent
 API_DIR = PROJECT_ROOT / "api"
 APP_DIR = PROJECT_ROOT / "app"
+API_LOG_FILE = PROJECT_ROOT / "uvicorn.log"
 
 # 서버 설정
 API_HOST = "127.0.0.1"
 API_PORT = 8000
 STREAMLIT_PORT = 8501
+# 실행한 자식 프로세스 (Popen 직후 등록 → 종료 시 atexit에서 정리)
+_child_processes = []
+
+# api/main.py와 동일하게 워커 하나로 시뮬레이션 LRU 캐시를 공유 (--workers로 변경 가능)
+API_WORKERS = 1
 
 def check_dependencies():
     """필요한 패키지가 설치되어 있는지 확인"""
     required_packages = ['fastapi', 'uvicorn', 'streamlit', 'requests']
-    missing_packages = []
-    
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_packages.append(package)
+    # 운영 모드 API 서버는 --http httptools / --loop uvloop로 실행 (uvicorn[standard]에 포함)
+    required_packages.append('httptools')
+    if sys.platform != "win32":  # uvloop은 Windows 미지원
+        required_packages.append('uvloop')
+    # find_spec은 모듈을 실행하지 않고 설치 여부만 확인 (streamlit 등 무거운 import 회피)
+    missing_packages = [
+        package for package in required_packages
+        if importlib.util.find_spec(package) is None
+    ]
     
     if missing_packages:
         print(f"❌ 다음 패키지들이 설치되지 않았습니다: {', '.join(missing_packages)}")
@@ -61,34 +78,150 @@ def check_file_structure():
     return True
 
 def is_port_in_use(port):
-    """포트가 사용 중인지 확인"""
-    import socket
+    """포트가 사용 중인지 확인
+
+    연결을 시도하지 않고 bind만 해본다. bind는 로컬에서 즉시 실패하므로
+    connect의 SYN 재시도를 기다릴 일이 없다. Linux에서는 SO_REUSEADDR로
+    TIME_WAIT 상태만 남은 포트를 사용 가능으로 본다.
+    """
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-        result = sock.connect_ex(('127.0.0.1', port))
-        return result == 0
+        # SO_REUSEADDR은 Linux에서만 켬: macOS/BSD에서는 다른 프로세스가 0.0.0.0에서
+        # LISTEN 중이어도 127.0.0.1 bind가 성공하고, Windows에서는 사용 중인 포트에도
+        # bind를 허용해 "사용 가능"으로 잘못 판단함
+        if sys.platform.startswith("linux"):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind(('127.0.0.1', port))
+        except OSError:
+            return True
+        return False
+
+def _listening_pids_proc(port):
+    """/proc에서 해당 포트를 LISTEN 중인 프로세스 PID 목록 조회 (Linux 전용)"""
+    inodes = set()
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(table) as f:
+                next(f)
+                for line in f:
+                    fields = line.split()
+                    # fields[1] = 로컬 주소(hex:hex), fields[3] = 상태(0A = LISTEN)
+                    if fields[3] == "0A" and int(fields[1].rsplit(":", 1)[1], 16) == port:
+                        inodes.add(f"socket:[{fields[9]}]")
+        except OSError:
+            continue
+    
+    if not inodes:
+        return set()
+    
+    pids = set()
+    for pid_dir in Path("/proc").iterdir():
+        if not pid_dir.name.isdigit():
+            continue
+        try:
+            for fd in (pid_dir / "fd").iterdir():
+                if os.readlink(fd) in inodes:
+                    pids.add(int(pid_dir.name))
+                    break
+        except OSError:
+            continue
+    return pids
+
+def _listening_pids_psutil(port):
+    """psutil로 해당 포트를 LISTEN 중인 프로세스 PID 목록 조회"""
+    try:
+        connections = [(conn.pid, conn) for conn in psutil.net_connections(kind='inet')]
+    except psutil.Error:
+        # macOS는 root가 아니면 시스템 전체 조회가 거부됨 → 접근 가능한 프로세스만 하나씩 확인
+        connections = []
+        for proc in psutil.process_iter():
+            try:
+                get_connections = getattr(proc, "net_connections", None) or proc.connections
+                connections.extend((proc.pid, conn) for conn in get_connections(kind='inet'))
+            except psutil.Error:
+                continue
+    
+    return {
+        pid for pid, conn in connections
+        if conn.laddr and conn.laddr.port == port
+        and conn.status == psutil.CONN_LISTEN and pid
+    }
+
+def find_listening_pids(port):
+    """해당 포트를 LISTEN 중인 프로세스 PID 목록 조회"""
+    if psutil is not None:
+        try:
+            return _listening_pids_psutil(port)
+        except psutil.Error:
+            pass
+    if os.path.isdir("/proc"):
+        return _listening_pids_proc(port)
+    return set()
+
+def terminate_port_owner(port):
+    """포트를 점유한 프로세스만 골라서 종료 요청"""
+    pids = find_listening_pids(port)
+    if not pids:
+        print(f"⚠️  포트 {port}을 사용하는 프로세스를 찾지 못했습니다.")
+        return False
+    
+    for pid in pids:
+        try:
+            if psutil is not None:
+                psutil.Process(pid).terminate()
+            else:
+                os.kill(pid, signal.SIGTERM)
+        except Exception:
+            pass
+    return True
+
+def wait_for_server(host, port, timeout=30, log_file=None):
+    """서버가 시작될 때까지 대기
 
-def wait_for_server(host, port, timeout=30):
-    """서버가 시작될 때까지 대기"""
+    표준 라이브러리 http.client로 /health를 짧은 간격(25ms부터 지수 증가)으로
+    요청합니다. --reload나 다중 워커에서는 앱 임포트 전에 감독 프로세스가
+    포트를 먼저 열기 때문에, TCP 연결만으로는 api/main.py 임포트 오류를
+    잡지 못합니다. 200 응답을 받아야 시작된 것으로 봅니다.
+    """
     print(f"🔄 서버 시작 대기 중... ({host}:{port})")
     
-    for i in range(timeout):
+    start = time.monotonic()
+    deadline = start + timeout
+    delay = 0.025
+    next_report = 0
+    
+    while time.monotonic() < deadline:
+        conn = http.client.HTTPConnection(host, port, timeout=1)
         try:
-            response = requests.get(f"http://{host}:{port}/health", timeout=1)
-            if response.status_code == 200:
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
                 print("✅ 서버가 성공적으로 시작되었습니다!")
                 return True
-        except requests.exceptions.RequestException:
+        except (OSError, http.client.HTTPException):
             pass
+        finally:
+            conn.close()
+        
+        time.sleep(delay)
+        delay = min(delay * 1.5, 0.5)
         
-        time.sleep(1)
-        if i % 5 == 0:
-            print(f"   대기 중... ({i}/{timeout}초)")
+        elapsed = int(time.monotonic() - start)
+        if elapsed >= next_report:
+            print(f"   대기 중... ({elapsed}/{timeout}초)")
+            next_report = elapsed + 5
     
     print("❌ 서버 시작 타임아웃")
+    if log_file is not None:
+        print(f"💡 서버 오류 로그를 확인하세요: {log_file}")
     return False
 
-def start_api_server():
-    """FastAPI 서버 시작"""
+def start_api_server(dev=False, workers=API_WORKERS):
+    """FastAPI 서버 시작
+
+    기본은 운영용 설정(uvloop + httptools, 접근 로그 끔)으로 실행하고,
+    dev=True일 때만 파일 변경 감지(--reload)를 켭니다. 서버 오류 출력(stderr)은 항상
+    uvicorn.log에 남기고, dev=True일 때는 일반 출력까지 함께 남깁니다.
+    """
     print("🚀 FastAPI 서버 시작 중...")
     
     # 포트 확인
@@ -98,12 +231,9 @@ def start_api_server():
         if response.lower() != 'y':
             return None
         
-        # 기존 프로세스 종료 시도
-        try:
-            subprocess.run(["pkill", "-f", "uvicorn.*main:app"], check=False)
+        # 기존 프로세스 종료 시도 (해당 포트를 LISTEN 중인 프로세스만)
+        if terminate_port_owner(API_PORT):
             time.sleep(2)
-        except:
-            pass
     
     # 서버 시작
     cmd = [
@@ -111,21 +241,35 @@ def start_api_server():
         "api.main:app",
         "--host", API_HOST,
         "--port", str(API_PORT),
-        "--reload"
     ]
     
+    if dev:
+        # --reload는 다중 워커와 함께 쓸 수 없음
+        cmd.append("--reload")
+    else:
+        cmd += [
+            "--loop", "asyncio" if sys.platform == "win32" else "uvloop",  # uvloop은 Windows 미지원
+            "--http", "httptools",
+            "--workers", str(workers),
+            "--no-access-log",
+        ]
+    
     try:
         # 백그라운드에서 실행
-        process = subprocess.Popen(
-            cmd,
-            cwd=PROJECT_ROOT,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
+        # 출력을 PIPE로 받으면서 읽지 않으면 버퍼가 가득 찼을 때 서버가 멈추므로 로그 파일에 이어서 기록.
+        # 운영 모드는 stderr(오류, traceback)만 남기고, 개발 모드는 stdout까지 모두 남김
+        with open(API_LOG_FILE, "ab") as log_file:
+            process = subprocess.Popen(
+                cmd,
+                cwd=PROJECT_ROOT,
+                stdout=log_file if dev else subprocess.DEVNULL,
+                stderr=subprocess.STDOUT if dev else log_file
+            )
+        # 서버 대기 중에 종료 시그널이 와도 정리 대상에 포함되도록 바로 등록
+        _child_processes.append(process)
         
         # 서버 시작 대기
-        if wait_for_server(API_HOST, API_PORT):
+        if wait_for_server(API_HOST, API_PORT, log_file=API_LOG_FILE):
             return process
         else:
             process.terminate()
@@ -157,30 +301,80 @@ def start_streamlit_app():
     try:
         # Streamlit은 포그라운드에서 실행
         process = subprocess.Popen(cmd, cwd=PROJECT_ROOT)
+        _child_processes.append(process)
         return process
         
     except Exception as e:
         print(f"❌ Streamlit 앱 시작 실패: {str(e)}")
         return None
 
+def _stop_process(process):
+    """SIGINT → SIGTERM → SIGKILL 순으로 점점 강하게 종료 요청"""
+    # Windows의 Popen은 SIGINT 전송을 지원하지 않으므로 바로 terminate
+    if sys.platform != "win32":
+        process.send_signal(signal.SIGINT)
+        try:
+            process.wait(timeout=2)
+            return
+        except subprocess.TimeoutExpired:
+            pass
+    
+    process.terminate()
+    try:
+        process.wait(timeout=3)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
 def cleanup_processes(*processes):
     """프로세스 정리"""
+    running = [p for p in processes if p and p.poll() is None]
+    if not running:
+        return
+    
     print("\n🛑 서버 종료 중...")
     
-    for process in processes:
-        if process and process.poll() is None:
-            try:
-                process.terminate()
-                process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                process.kill()
-            except:
-                pass
+    for process in running:
+        try:
+            _stop_process(process)
+        except Exception:
+            pass
     
     print("✅ 모든 프로세스가 종료되었습니다.")
 
+def _exit_on_signal(signum, frame):
+    """SIGTERM/SIGHUP을 정상 종료로 바꿔 atexit 정리가 실행되게 함"""
+    sys.exit(0)
+
+def register_cleanup():
+    """어떤 경로로 종료되든 자식 프로세스를 한 번만 정리하도록 등록
+
+    finally 블록은 SIGTERM(docker stop, systemd 등)에서는 실행되지 않으므로
+    atexit에 정리 함수를 걸고 종료 시그널을 sys.exit로 바꾼다.
+    정리 대상은 Popen 직후 _child_processes에 추가된 프로세스들이다.
+    """
+    atexit.register(lambda: cleanup_processes(*_child_processes))
+    for sig_name in ("SIGTERM", "SIGHUP"):  # SIGHUP은 Windows에 없음
+        sig = getattr(signal, sig_name, None)
+        if sig is not None:
+            signal.signal(sig, _exit_on_signal)
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="AI 협상 시뮬레이터 실행")
+    parser.add_argument(
+        "--dev", action="store_true",
+        help="개발 모드: API 서버를 --reload로 실행"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=API_WORKERS,
+        help=f"API 서버 워커 수 (기본값: {API_WORKERS}, --dev에서는 무시)"
+    )
+    return parser.parse_args()
+
 def main():
     """메인 실행 함수"""
+    args = parse_args()
+    
     print("🤝 AI 협상 시뮬레이터 시작")
     print("=" * 50)
     
@@ -191,12 +385,12 @@ def main():
     if not check_file_structure():
         sys.exit(1)
     
-    api_process = None
-    streamlit_process = None
+    # 시작한 프로세스는 종료 시 atexit에서 정리
+    register_cleanup()
     
     try:
         # API 서버 시작
-        api_process = start_api_server()
+        api_process = start_api_server(dev=args.dev, workers=args.workers)
         if not api_process:
             print("❌ API 서버 시작에 실패했습니다.")
             sys.exit(1)
@@ -207,7 +401,6 @@ def main():
         streamlit_process = start_streamlit_app()
         if not streamlit_process:
             print("❌ Streamlit 앱 시작에 실패했습니다.")
-            cleanup_processes(api_process)
             sys.exit(1)
         
         print(f"✅ Streamlit 앱: http://127.0.0.1:{STREAMLIT_PORT}")
@@ -223,9 +416,6 @@ def main():
     
     except Exception as e:
         print(f"❌ 예상치 못한 오류: {str(e)}")
-    
-    finally:
-        cleanup_processes(api_process, streamlit_process)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file